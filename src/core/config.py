@@ -52,7 +52,8 @@ class Config:
                 "nsfw_filter": "hide",
                 "nsfw_blur_radius": 25,
                 "e_rating_filter": "hide",
-                "e_rating_blur_radius": 25
+                "e_rating_blur_radius": 25,
+                "opengl_viewer": True  # 图片查看器使用 OpenGL 视口渲染
             },
             "network": {
                 "use_proxy": False,
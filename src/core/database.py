@@ -7,6 +7,7 @@
 import sqlite3
 import json
 import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -22,11 +23,33 @@ class DatabaseManager:
             db_path = config_dir / "falconpy.db"
         
         self.db_path = str(db_path)
+        # 每个线程复用一条连接，避免每次操作重新打开数据库
+        self._local = threading.local()
         self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        获取当前线程的数据库连接（首次使用时创建）
+        连接级设置：启用外键约束（SQLite 默认关闭，ON DELETE CASCADE 需逐连接开启），
+        WAL 日志使后台写入不阻塞读取，synchronous=NORMAL 在 WAL 下仍保证一致性
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA foreign_keys = ON")
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.execute("PRAGMA cache_size = -20000")
+            except sqlite3.DatabaseError:
+                # 只读介质等不支持 WAL 的环境下保持默认日志模式
+                pass
+            self._local.conn = conn
+        return conn
     
     def init_database(self):
         """初始化数据库"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # 创建收藏夹表
@@ -74,12 +97,24 @@ class DatabaseManager:
                     searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
+
+            # 清理外键未启用时遗留的孤儿记录：启用外键后不会再产生，
+            # 因此只在 user_version 为 0 的旧库上执行一次，之后标记为 1
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < 1:
+                cursor.execute(
+                    "DELETE FROM favorite_images WHERE favorite_id NOT IN (SELECT id FROM favorites)"
+                )
+                cursor.execute(
+                    "DELETE FROM folders WHERE parent_id IS NOT NULL AND parent_id NOT IN (SELECT id FROM folders)"
+                )
+                cursor.execute("PRAGMA user_version = 1")
             
             conn.commit()
     
     def create_favorite(self, name: str, description: str = "") -> int:
         """创建收藏夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO favorites (name, description) VALUES (?, ?)",
@@ -90,7 +125,7 @@ class DatabaseManager:
     
     def get_favorites(self) -> List[Dict[str, Any]]:
         """获取所有收藏夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM favorites ORDER BY created_at DESC")
             rows = cursor.fetchall()
@@ -107,7 +142,7 @@ class DatabaseManager:
             return favorites
 
     def get_favorite_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM favorites WHERE name = ?", (name,))
             row = cursor.fetchone()
@@ -122,15 +157,15 @@ class DatabaseManager:
             }
     
     def delete_favorite(self, favorite_id: int):
-        """删除收藏夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        """删除收藏夹（其中的图片由外键 ON DELETE CASCADE 一并删除）"""
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM favorites WHERE id = ?", (favorite_id,))
             conn.commit()
     
     def add_image_to_favorite(self, favorite_id: int, image_id: str, site: str, image_data: Dict[str, Any]):
         """添加图片到收藏夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             try:
                 cursor.execute(
@@ -145,7 +180,7 @@ class DatabaseManager:
     
     def remove_image_from_favorite(self, favorite_id: int, image_id: str, site: str):
         """从收藏夹移除图片"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM favorite_images WHERE favorite_id = ? AND image_id = ? AND site = ?",
@@ -154,7 +189,7 @@ class DatabaseManager:
             conn.commit()
 
     def remove_image_global(self, image_id: str, site: str) -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM favorite_images WHERE image_id = ? AND site = ?",
@@ -165,7 +200,7 @@ class DatabaseManager:
     
     def get_favorite_images(self, favorite_id: int) -> List[Dict[str, Any]]:
         """获取收藏夹中的图片"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM favorite_images WHERE favorite_id = ? ORDER BY added_at DESC",
@@ -247,7 +282,7 @@ class DatabaseManager:
     
     def is_image_favorited(self, image_id: str, site: str) -> bool:
         """检查图片是否已收藏"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT COUNT(*) FROM favorite_images WHERE image_id = ? AND site = ?",
@@ -258,7 +293,7 @@ class DatabaseManager:
     
     def add_search_history(self, site: str, tags: str):
         """添加搜索历史"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO search_history (site, tags) VALUES (?, ?)",
@@ -268,7 +303,7 @@ class DatabaseManager:
     
     def get_search_history(self, site: str = None, limit: int = 50) -> List[Dict[str, Any]]:
         """获取搜索历史"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             if site:
                 cursor.execute(
@@ -294,7 +329,7 @@ class DatabaseManager:
     
     def clear_search_history(self, site: str = None):
         """清空搜索历史"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             if site:
                 cursor.execute("DELETE FROM search_history WHERE site = ?", (site,))
@@ -304,7 +339,7 @@ class DatabaseManager:
     
     def create_folder(self, name: str, parent_id: int = None) -> int:
         """创建文件夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO folders (name, parent_id) VALUES (?, ?)",
@@ -312,10 +347,10 @@ class DatabaseManager:
             )
             conn.commit()
             return cursor.lastrowid
-    
+
     def get_folders(self, parent_id: int = None) -> List[Dict[str, Any]]:
         """获取文件夹列表"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             if parent_id is None:
                 cursor.execute("SELECT * FROM folders WHERE parent_id IS NULL ORDER BY created_at ASC")
@@ -334,15 +369,29 @@ class DatabaseManager:
             return folders
     
     def delete_folder(self, folder_id: int):
-        """删除文件夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        """删除文件夹（子文件夹由外键 ON DELETE CASCADE 一并删除）"""
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
             conn.commit()
     
     def rename_folder(self, folder_id: int, new_name: str):
         """重命名文件夹"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("UPDATE folders SET name = ? WHERE id = ?", (new_name, folder_id))
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+
+
+_INSTANCE: Optional[DatabaseManager] = None
+_INSTANCE_LOCK = threading.Lock()
+
+
+def get_db() -> DatabaseManager:
+    """返回进程共享的 DatabaseManager（默认数据库路径），各窗口共用连接与文件夹缓存"""
+    global _INSTANCE
+    if _INSTANCE is None:
+        with _INSTANCE_LOCK:
+            if _INSTANCE is None:
+                _INSTANCE = DatabaseManager()
+    return _INSTANCE
@@ -9,14 +9,14 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt
 from ...core.config import Config
 
-from ...core.database import DatabaseManager
+from ...core.database import get_db
 
 
 class FavoriteDestinationDialog(QDialog):
     def __init__(self, site_key: str, parent=None):
         super().__init__(parent)
         self.site_key = site_key
-        self.db = DatabaseManager()
+        self.db = get_db()
         self.cfg = Config()
         self.setWindowTitle("选择收藏目标")
         self.setMinimumWidth(420)
@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                             QFileDialog, QColorDialog)
 from PyQt6.QtCore import Qt, pyqtSignal, QSettings, QProcess
 from PyQt6.QtGui import QColor, QPalette
-from ...core.database import DatabaseManager
+from ...core.database import get_db
 from ...core.i18n import I18n
 from ...core.config import Config
 
@@ -21,7 +21,7 @@ class FavoritesTab(QWidget):
         super().__init__()
         self.config = config
         self.i18n = i18n or I18n(config.get('appearance.language', 'zh_CN'))
-        self.db = DatabaseManager()
+        self.db = get_db()
         self.site_keys = [
             ("Danbooru", "danbooru"),
             ("Konachan", "konachan"),
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QToolBar, QStatusBar, QSplitter, QTabWidget,
                             QComboBox, QLineEdit, QPushButton, QScrollArea,
                             QGridLayout, QLabel, QFrame, QMenuBar, QMenu, QMessageBox, QDialog, QApplication, QProgressDialog, QFileDialog)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer, QThreadPool
 from PyQt6.QtGui import QAction, QIcon, QPalette, QColor
 import os
 import json
@@ -27,16 +27,17 @@ from .themes.theme_manager import ThemeManager
 from .threads.favorites_thread import FavoritesFetchThread
 from .threads.tags_fetch_thread import TagsFetchThread
 from .threads.tags_query_thread import TagsQueryThread
-from .threads.online_favorite_thread import OnlineFavoriteOpThread
+from .threads.online_favorite_thread import OnlineFavoriteOpTask
 from .widgets.tag_suggest import TagSuggest
 from .dialogs.favorite_destination_dialog import FavoriteDestinationDialog
 from ..core.config import Config
-from ..core.database import DatabaseManager
+from ..core.database import get_db
 from ..core.session_manager import SessionManager
 from ..core.cache_manager import CacheManager
 from ..core.i18n import I18n
 from ..core.update_manager import UpdateManager
-from .threads.update_check_thread import UpdateCheckThread
+from .threads.update_check_thread import UpdateCheckTask
+from .threads.db_write_thread import DbWriteTask
 
 class MainWindow(QMainWindow):
     """主窗口"""
@@ -46,7 +47,7 @@ class MainWindow(QMainWindow):
         
         # 初始化配置和数据库
         self.config = Config()
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_db()
         self.session_manager = SessionManager()
         self.theme_manager = ThemeManager()
         
@@ -70,7 +71,16 @@ class MainWindow(QMainWindow):
         self._last_query = ''
         self._last_site = ''
         self._last_page = 1
-        self._bg_threads = []
+        # 线程池任务的信号对象：保持引用直到结果送达 GUI 线程
+        self._bg_signals = []
+        # 本地收藏写入：单线程池串行执行，保证增删顺序且不阻塞 UI
+        self._db_pool = QThreadPool(self)
+        self._db_pool.setMaxThreadCount(1)
+        # 退出前等待尚未完成的本地收藏写入落盘
+        try:
+            QApplication.instance().aboutToQuit.connect(self._wait_db_writes)
+        except Exception:
+            pass
         self._tag_cache = {}
         self._tag_retry = {}
         self._tag_thread = None
@@ -551,21 +561,24 @@ class MainWindow(QMainWindow):
         return None
 
     def _start_online_fav_op(self, site: str, op: str, post_id: str):
-        try:
-            th = getattr(self, '_online_fav_thread', None)
-            if th and th.isRunning():
-                try:
-                    th.finished_ok.disconnect()
-                    th.error.disconnect()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        th = OnlineFavoriteOpThread(self.api_manager, site, op, post_id)
-        th.finished_ok.connect(lambda ok: self.status_bar.showMessage('在线收藏已更新' if ok else '在线收藏更新失败', 3000))
-        th.error.connect(lambda m: self.status_bar.showMessage(f'在线收藏操作错误：{m}', 5000))
+        # 只断开上一个任务的状态栏提示；其释放 _bg_signals 的连接保留，任务结束后照常移除
+        for signal, slot in getattr(self, '_online_fav_status_slots', ()):
+            try:
+                signal.disconnect(slot)
+            except Exception:
+                pass
+        th = OnlineFavoriteOpTask(self.api_manager, site, op, post_id)
+        sig = th.signals
+        self._bg_signals.append(sig)
+        on_ok = lambda ok: self.status_bar.showMessage('在线收藏已更新' if ok else '在线收藏更新失败', 3000)
+        on_error = lambda m: self.status_bar.showMessage(f'在线收藏操作错误：{m}', 5000)
+        sig.finished_ok.connect(on_ok)
+        sig.error.connect(on_error)
+        self._online_fav_status_slots = ((sig.finished_ok, on_ok), (sig.error, on_error))
+        sig.finished_ok.connect(lambda _ok: self._release_bg_signals(sig))
+        sig.error.connect(lambda _m: self._release_bg_signals(sig))
         self._online_fav_thread = th
-        th.start()
+        QThreadPool.globalInstance().start(th)
     
     def setup_shortcuts(self):
         """设置快捷键"""
@@ -609,12 +622,9 @@ class MainWindow(QMainWindow):
     
     def _on_update_timer(self):
         try:
-            t = UpdateCheckThread(self.update_manager)
-            try:
-                t.setParent(self)
-            except Exception:
-                pass
-            self._bg_threads.append(t)
+            t = UpdateCheckTask(self.update_manager)
+            sig = t.signals
+            self._bg_signals.append(sig)
             def _handle(info: dict):
                 try:
                     if info.get('has_update'):
@@ -650,23 +660,20 @@ class MainWindow(QMainWindow):
                 except Exception:
                     pass
             try:
-                t.done.connect(_handle)
-                t.finished.connect(lambda: self._cleanup_bg_thread(t))
+                sig.done.connect(_handle)
+                sig.done.connect(lambda _info: self._release_bg_signals(sig))
             except Exception:
                 pass
-            t.start()
+            QThreadPool.globalInstance().start(t)
         except Exception:
             pass
     
     def check_for_updates(self):
         try:
             self.status_bar.showMessage(self.i18n.t('正在检查更新...'), 2000)
-            t = UpdateCheckThread(self.update_manager)
-            try:
-                t.setParent(self)
-            except Exception:
-                pass
-            self._bg_threads.append(t)
+            t = UpdateCheckTask(self.update_manager)
+            sig = t.signals
+            self._bg_signals.append(sig)
             def _handle(info: dict):
                 try:
                     if info.get('has_update'):
@@ -700,19 +707,77 @@ class MainWindow(QMainWindow):
                 except Exception:
                     pass
             try:
-                t.done.connect(_handle)
-                t.finished.connect(lambda: self._cleanup_bg_thread(t))
+                sig.done.connect(_handle)
+                sig.done.connect(lambda _info: self._release_bg_signals(sig))
             except Exception:
                 pass
-            t.start()
+            QThreadPool.globalInstance().start(t)
+        except Exception:
+            pass
+
+    def _run_db_write(self, fn, on_done):
+        """在数据库写入线程池中执行 fn，完成后在 GUI 线程回调 on_done(ok, result)"""
+        t = DbWriteTask(fn)
+        sig = t.signals
+        self._bg_signals.append(sig)
+        sig.done.connect(on_done)
+        sig.done.connect(lambda _ok, _res: self._release_bg_signals(sig))
+        self._db_pool.start(t)
+
+    def _add_local_favorite(self, fav_id, image_data: dict, site: str):
+        """后台写入本地收藏夹；fav_id 为空时使用默认收藏夹"""
+        img_id = str(image_data.get('id'))
+
+        def _write():
+            target = fav_id
+            # 记住的站点默认收藏夹可能已被删除；启用外键后插入会失败，回退到默认收藏夹
+            if target and not any(str(f.get('id')) == str(target) for f in self.db_manager.get_favorites()):
+                target = None
+            target = target or self._get_default_favorite_id()
+            return self.db_manager.add_image_to_favorite(target, img_id, site, image_data)
+
+        def _done(ok, result):
+            if not ok:
+                QMessageBox.warning(self, "错误", f"添加到本地收藏夹失败：{result}")
+                return
+            if not result:
+                # add_image_to_favorite 返回 False：图片已在该收藏夹中，未写入新记录
+                self.status_bar.showMessage("图片已在本地收藏夹中", 2000)
+                return
+            self.status_bar.showMessage("已添加到本地收藏夹", 2000)
+            self._refresh_favorites_if_active()
+
+        self._run_db_write(_write, _done)
+
+    def _remove_local_favorite(self, fav_id, image_data: dict, site: str):
+        """后台从本地收藏夹移除；fav_id 为空时使用默认收藏夹"""
+        img_id = str(image_data.get('id'))
+
+        def _write():
+            target = fav_id or self._get_default_favorite_id()
+            self.db_manager.remove_image_from_favorite(target, img_id, site)
+
+        def _done(ok, result):
+            if not ok:
+                QMessageBox.warning(self, "错误", f"移除本地收藏失败：{result}")
+                return
+            self.status_bar.showMessage("已从本地收藏夹移除", 2000)
+            self._refresh_favorites_if_active()
+
+        self._run_db_write(_write, _done)
+
+    def _wait_db_writes(self):
+        """应用退出时等待数据库写入线程池中的任务完成（最多 2 秒）"""
+        try:
+            self._db_pool.waitForDone(2000)
         except Exception:
             pass
 
-    def _cleanup_bg_thread(self, thread):
+    def _release_bg_signals(self, signals):
         try:
-            if thread in getattr(self, '_bg_threads', []):
-                self._bg_threads.remove(thread)
-            thread.deleteLater()
+            if signals in self._bg_signals:
+                self._bg_signals.remove(signals)
+            signals.deleteLater()
         except Exception:
             pass
     
@@ -820,28 +885,14 @@ class MainWindow(QMainWindow):
             if not sel:
                 return
             if sel.get('destination') == 'local':
-                fav_id = sel.get('folder_id') or self._get_default_favorite_id()
-                try:
-                    img_id = str(image_data.get('id'))
-                    self.db_manager.add_image_to_favorite(fav_id, img_id, site, image_data)
-                    self.status_bar.showMessage("已添加到本地收藏夹", 2000)
-                    self._refresh_favorites_if_active()
-                except Exception as e:
-                    QMessageBox.warning(self, "错误", f"添加到本地收藏夹失败：{str(e)}")
+                self._add_local_favorite(sel.get('folder_id'), image_data, site)
             else:
                 post_id = str(image_data.get('id'))
                 self._start_online_fav_op(site, 'add', post_id)
         else:
             dest = self._get_site_dest_default(site)
             if dest == 'local':
-                fav_id = self._get_site_default_fav_id(site) or self._get_default_favorite_id()
-                try:
-                    img_id = str(image_data.get('id'))
-                    self.db_manager.remove_image_from_favorite(fav_id, img_id, site)
-                    self.status_bar.showMessage("已从本地收藏夹移除", 2000)
-                    self._refresh_favorites_if_active()
-                except Exception as e:
-                    QMessageBox.warning(self, "错误", f"移除本地收藏失败：{str(e)}")
+                self._remove_local_favorite(self._get_site_default_fav_id(site), image_data, site)
             else:
                 post_id = str(image_data.get('id'))
                 self._start_online_fav_op(site, 'remove', post_id)
@@ -945,38 +996,48 @@ class MainWindow(QMainWindow):
         # 移除侧栏后不再连接收藏夹面板信号
         
     def add_to_favorites(self, image_data: dict):
-        try:
+        img_id = str(image_data.get('id'))
+        site = (image_data.get('site') or 'unknown').lower()
+
+        def _write():
             favorite_id = self._get_default_favorite_id()
-            img_id = str(image_data.get('id'))
-            site = (image_data.get('site') or 'unknown').lower()
-            success = self.db_manager.add_image_to_favorite(favorite_id, img_id, site, image_data)
-            if success:
+            return self.db_manager.add_image_to_favorite(favorite_id, img_id, site, image_data)
+
+        def _done(ok, result):
+            if not ok:
+                QMessageBox.warning(self, "错误", f"添加到收藏夹失败：{result}")
+                return
+            if result:
                 self.status_bar.showMessage("已添加到收藏夹：默认收藏夹", 2000)
             else:
                 self.status_bar.showMessage("该图片已在收藏夹中", 2000)
             self._refresh_favorites_if_active()
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"添加到收藏夹失败：{str(e)}")
+
+        self._run_db_write(_write, _done)
 
     def remove_from_favorites(self, image_data: dict):
-        try:
-            img_id = str(image_data.get('id'))
-            site = (image_data.get('site') or 'unknown').lower()
+        img_id = str(image_data.get('id'))
+        site = (image_data.get('site') or 'unknown').lower()
+        # 站点默认收藏夹来自配置，在 GUI 线程读取
+        site_fav_id = self._get_site_default_fav_id(site)
+
+        def _write():
             try:
-                cnt = self.db_manager.remove_image_global(img_id, site)
-                if cnt > 0:
-                    self.status_bar.showMessage("已从收藏夹移除", 2000)
-                else:
-                    fav_id = self._get_site_default_fav_id(site) or self._get_default_favorite_id()
-                    self.db_manager.remove_image_from_favorite(fav_id, img_id, site)
-                    self.status_bar.showMessage("已从收藏夹移除", 2000)
+                if self.db_manager.remove_image_global(img_id, site) > 0:
+                    return
             except Exception:
-                fav_id = self._get_site_default_fav_id(site) or self._get_default_favorite_id()
-                self.db_manager.remove_image_from_favorite(fav_id, img_id, site)
-                self.status_bar.showMessage("已从收藏夹移除", 2000)
+                pass
+            fav_id = site_fav_id or self._get_default_favorite_id()
+            self.db_manager.remove_image_from_favorite(fav_id, img_id, site)
+
+        def _done(ok, result):
+            if not ok:
+                QMessageBox.warning(self, "错误", f"移除收藏失败：{result}")
+                return
+            self.status_bar.showMessage("已从收藏夹移除", 2000)
             self._refresh_favorites_if_active()
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"移除收藏失败：{str(e)}")
+
+        self._run_db_write(_write, _done)
 
     def refresh_content(self):
         try:
@@ -1541,8 +1602,8 @@ class MainWindow(QMainWindow):
                                 self.pid = pid
                             def run(self):
                                 try:
-                                    from .threads.api_search_thread import _ensure_shared_loop
-                                    loop = _ensure_shared_loop()
+                                    from .threads._async_runtime import ensure_shared_loop
+                                    loop = ensure_shared_loop()
                                     import asyncio, concurrent.futures
                                     f = asyncio.run_coroutine_threadsafe(
                                         self.api_manager.get_post(self.site, self.pid), loop
@@ -1837,8 +1898,8 @@ class MainWindow(QMainWindow):
                 except Exception:
                     pass
                 if ok:
+                    # 成功只在状态栏提示，不弹模态框打断连续操作；失败仍弹窗
                     self.status_bar.showMessage(self.i18n.t("下载完成: {file}").format(file=Path(path).name), 3000)
-                    QMessageBox.information(self, self.i18n.t("完成"), self.i18n.t("已保存到:\n{path}").format(path=path))
                 else:
                     if (str(err) == '403' or '403' in str(err)) and url_primary and url_fallback and (url_fallback != url_primary):
                         alt = _build_task(url_fallback)
@@ -1852,7 +1913,7 @@ class MainWindow(QMainWindow):
                             dl2.task_progress.connect(lambda i,c,t: (_on_progress(i,c,t), alt_progress.set_value(c) if t>0 else alt_progress.set_text(f"已下载 {c/(1024*1024):.2f} MB")))
                             dl2.task_finished.connect(lambda i,ok2,p2,e2: (
                                 alt_progress.close(),
-                                QMessageBox.information(self, self.i18n.t("完成"), self.i18n.t("已保存到:\n{path}").format(path=p2)) if ok2 else QMessageBox.warning(self, self.i18n.t("下载失败"), self.i18n.t("错误: {msg}").format(msg=str(e2)))
+                                self.status_bar.showMessage(self.i18n.t("下载完成: {file}").format(file=Path(p2).name), 3000) if ok2 else QMessageBox.warning(self, self.i18n.t("下载失败"), self.i18n.t("错误: {msg}").format(msg=str(e2)))
                             ))
                             dl2.start()
                             return
@@ -2222,21 +2283,24 @@ class PerformancePanel(QDialog):
         return None
 
     def _start_online_fav_op(self, site: str, op: str, post_id: str):
-        try:
-            th = getattr(self, '_online_fav_thread', None)
-            if th and th.isRunning():
-                try:
-                    th.finished_ok.disconnect()
-                    th.error.disconnect()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        th = OnlineFavoriteOpThread(self.api_manager, site, op, post_id)
-        th.finished_ok.connect(lambda ok: self.status_bar.showMessage('在线收藏已更新' if ok else '在线收藏更新失败', 3000))
-        th.error.connect(lambda m: self.status_bar.showMessage(f'在线收藏操作错误：{m}', 5000))
+        # 只断开上一个任务的状态栏提示；其释放 _bg_signals 的连接保留，任务结束后照常移除
+        for signal, slot in getattr(self, '_online_fav_status_slots', ()):
+            try:
+                signal.disconnect(slot)
+            except Exception:
+                pass
+        th = OnlineFavoriteOpTask(self.api_manager, site, op, post_id)
+        sig = th.signals
+        self._bg_signals.append(sig)
+        on_ok = lambda ok: self.status_bar.showMessage('在线收藏已更新' if ok else '在线收藏更新失败', 3000)
+        on_error = lambda m: self.status_bar.showMessage(f'在线收藏操作错误：{m}', 5000)
+        sig.finished_ok.connect(on_ok)
+        sig.error.connect(on_error)
+        self._online_fav_status_slots = ((sig.finished_ok, on_ok), (sig.error, on_error))
+        sig.finished_ok.connect(lambda _ok: self._release_bg_signals(sig))
+        sig.error.connect(lambda _m: self._release_bg_signals(sig))
         self._online_fav_thread = th
-        th.start()
+        QThreadPool.globalInstance().start(th)
 
     def _start_online_fav_fetch(self):
         """启动在线收藏获取（仅 Danbooru）"""
@@ -2624,23 +2688,10 @@ class PerformancePanel(QDialog):
             pass
 
         try:
-            for t in list(getattr(self, '_bg_threads', [])):
-                try:
-                    t.requestInterruption()
-                except Exception:
-                    pass
-                try:
-                    t.quit()
-                    if not t.wait(500):
-                        t.terminate()
-                        t.wait()
-                except Exception:
-                    try:
-                        t.terminate()
-                        t.wait()
-                    except Exception:
-                        pass
-            self._bg_threads.clear()
+            th = getattr(self, '_online_fav_thread', None)
+            if th:
+                th.cancel()
+            self._bg_signals.clear()
         except Exception:
             pass
         # 关闭 API 层的连接池与可能存在的会话
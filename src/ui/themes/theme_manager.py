@@ -11,10 +11,26 @@ class ThemeManager(QObject):
     """主题管理器"""
     
     theme_changed = pyqtSignal(str)  # 主题改变信号
+
+    # 复选框/单选框指示器尺寸覆盖样式，参数依次为 (sz, sz, sz, sz, radius)
+    _OVERRIDE_TMPL = (
+        "QCheckBox::indicator {width:%dpx;height:%dpx;border-radius:3px;margin-right:6px;}\n"
+        "QRadioButton::indicator {width:%dpx;height:%dpx;border-radius:%dpx;margin-right:6px;}"
+    )
     
     def __init__(self):
         super().__init__()
         self.current_theme = "win11"
+        # 最终样式表缓存：(主题名, 指示器尺寸) -> 拼接后的样式表
+        self._style_cache = {}
+        # 指示器尺寸依赖应用字体：初始化时计算一次，仅在字体变化时重算
+        self._app = QApplication.instance()
+        self._font_px_size = self._compute_indicator_px()
+        if self._app is not None:
+            try:
+                self._app.fontChanged.connect(self._on_font_changed)
+            except Exception:
+                pass
         
         # 定义主题样式
         self.themes = {
@@ -1847,32 +1863,29 @@ class ThemeManager(QObject):
             }
         """
     
+    def _compute_indicator_px(self) -> int:
+        try:
+            fm = QFontMetrics(self._app.font())
+            return max(10, min(16, int(round(fm.height() * 0.65))))
+        except Exception:
+            return 12
+
+    def _on_font_changed(self, *args):
+        self._font_px_size = self._compute_indicator_px()
+        self._style_cache.clear()
+
     def apply_theme(self, theme_name: str, widget=None):
         """应用主题"""
         if theme_name not in self.themes:
             theme_name = "light"
         self.current_theme = theme_name
-        style = self.themes[theme_name]
-        try:
-            fm = QFontMetrics(QApplication.instance().font())
-            sz = max(10, min(16, int(round(fm.height() * 0.65))))
-        except Exception:
-            sz = 12
-        override = f"""
-            QCheckBox::indicator {{
-                width: {sz}px;
-                height: {sz}px;
-                border-radius: 3px;
-                margin-right: 6px;
-            }}
-            QRadioButton::indicator {{
-                width: {sz}px;
-                height: {sz}px;
-                border-radius: {max(5, sz//2)}px;
-                margin-right: 6px;
-            }}
-        """
-        style = style + "\n" + override
+        sz = self._font_px_size
+        key = (theme_name, sz)
+        style = self._style_cache.get(key)
+        if style is None:
+            override = self._OVERRIDE_TMPL % (sz, sz, sz, sz, max(5, sz // 2))
+            style = f"{self.themes[theme_name]}\n{override}"
+            self._style_cache[key] = style
         if widget:
             widget.setStyleSheet(style)
         else:
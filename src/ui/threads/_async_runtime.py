@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+进程级共享 asyncio 事件循环：所有后台线程通过 run_coroutine_threadsafe 提交协程，
+避免每个模块/每次操作各自创建事件循环。
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+
+_SHARED_LOOP = None
+_SHARED_THREAD = None
+_LOCK = threading.Lock()
+
+
+def ensure_shared_loop() -> asyncio.AbstractEventLoop:
+    """返回共享事件循环；首次调用时在守护线程中启动。"""
+    global _SHARED_LOOP, _SHARED_THREAD
+    if _SHARED_LOOP and _SHARED_THREAD and _SHARED_THREAD.is_alive():
+        return _SHARED_LOOP
+    with _LOCK:
+        # 双重检查，避免多个线程同时首次调用时重复创建
+        if _SHARED_LOOP and _SHARED_THREAD and _SHARED_THREAD.is_alive():
+            return _SHARED_LOOP
+        loop = asyncio.new_event_loop()
+        def _runner():
+            asyncio.set_event_loop(loop)
+            loop.run_forever()
+        t = threading.Thread(target=_runner, name="FalconPyAsyncLoop", daemon=True)
+        t.start()
+        _SHARED_LOOP = loop
+        _SHARED_THREAD = t
+        return loop
+
+
+class PendingFutures:
+    """线程安全地登记 run_coroutine_threadsafe 返回的 future，供跨线程取消。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures = deque()
+        self._cancelled = False
+
+    def add(self, fut):
+        with self._lock:
+            if not self._cancelled:
+                self._futures.append(fut)
+                return
+        # 登记前已请求取消：立即取消，避免漏掉
+        fut.cancel()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            pending = list(self._futures)
+        for f in pending:
+            f.cancel()
+
+    def clear(self):
+        """取消尚未完成的 future 并清空（已完成的 cancel() 为空操作）。"""
+        with self._lock:
+            pending = list(self._futures)
+            self._futures.clear()
+        for f in pending:
+            f.cancel()
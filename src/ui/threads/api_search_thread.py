@@ -5,27 +5,11 @@ API 搜索线程：在后台线程中运行异步搜索，避免阻塞 UI。
 """
 
 from PyQt6.QtCore import QThread, pyqtSignal
-import threading
 import asyncio
 import concurrent.futures
 
+from ._async_runtime import PendingFutures, ensure_shared_loop
 
-_SHARED_LOOP = None
-_SHARED_THREAD = None
-
-def _ensure_shared_loop():
-    global _SHARED_LOOP, _SHARED_THREAD
-    if _SHARED_LOOP and _SHARED_THREAD and _SHARED_THREAD.is_alive():
-        return _SHARED_LOOP
-    loop = asyncio.new_event_loop()
-    def _runner():
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-    t = threading.Thread(target=_runner, name="FalconPyAsyncLoop", daemon=True)
-    t.start()
-    _SHARED_LOOP = loop
-    _SHARED_THREAD = t
-    return loop
 
 class APISearchThread(QThread):
     """使用 asyncio 运行 APIManager.search 的线程"""
@@ -41,54 +25,46 @@ class APISearchThread(QThread):
         self.page = page
         self.limit = limit
         # 事件循环与任务引用，用于跨线程取消
-        self._futures = []
+        self._futures = PendingFutures()
         self._cancelled = False
 
     def cancel(self):
         """请求中断并取消正在运行的异步任务。"""
-        try:
-            self._cancelled = True
-            self.requestInterruption()
-            for f in list(self._futures):
-                try:
-                    f.cancel()
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        self._cancelled = True
+        self.requestInterruption()
+        self._futures.cancel()
 
     def run(self):
         try:
-            loop = _ensure_shared_loop()
+            loop = ensure_shared_loop()
             if self.isInterruptionRequested() or self._cancelled:
                 return
-            f_search = asyncio.run_coroutine_threadsafe(
-                self.api_manager.search(self.site, self.query, self.page, self.limit), loop
-            )
-            self._futures = [f_search]
+            async def _task():
+                # 搜索与计数相互独立，同时启动以重叠两次网络往返
+                count_task = asyncio.ensure_future(self.api_manager.count(self.site, self.query))
+                try:
+                    results = await self.api_manager.search(self.site, self.query, self.page, self.limit)
+                except BaseException:
+                    count_task.cancel()
+                    raise
+                try:
+                    total_count = await asyncio.wait_for(count_task, 8.0)
+                except Exception:
+                    # 计数超时或失败时回退到按结果数估算页数
+                    total_count = None
+                return results, total_count
+
+            fut = asyncio.run_coroutine_threadsafe(_task(), loop)
+            self._futures.add(fut)
             try:
-                results = f_search.result()
+                results, total_count = fut.result()
             except concurrent.futures.CancelledError:
                 return
-            except Exception as e:
-                raise e
             if self.isInterruptionRequested() or self._cancelled:
                 return
             total_pages = None
-            try:
-                f_count = asyncio.run_coroutine_threadsafe(
-                    self.api_manager.count(self.site, self.query), loop
-                )
-                self._futures.append(f_count)
-                total_count = f_count.result(timeout=8.0)
-                if isinstance(total_count, int) and total_count >= 0:
-                    total_pages = max(1, (total_count + self.limit - 1) // self.limit)
-            except concurrent.futures.TimeoutError:
-                total_pages = None
-            except concurrent.futures.CancelledError:
-                return
-            except Exception:
-                total_pages = None
+            if isinstance(total_count, int) and total_count >= 0:
+                total_pages = max(1, (total_count + self.limit - 1) // self.limit)
             if total_pages is None:
                 results_len = len(results) if isinstance(results, list) else 0
                 if results_len == 0:
@@ -102,13 +78,4 @@ class APISearchThread(QThread):
             if not self._cancelled:
                 self.error.emit(str(e))
         finally:
-            try:
-                for f in list(self._futures):
-                    try:
-                        if not f.done():
-                            f.cancel()
-                    except Exception:
-                        pass
-                self._futures.clear()
-            except Exception:
-                pass
+            self._futures.clear()
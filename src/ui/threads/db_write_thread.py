@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+本地数据库写入任务：在线程池中执行 SQLite 写操作，避免磁盘同步阻塞 UI。
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class DbWriteSignals(QObject):
+    done = pyqtSignal(bool, object)  # (是否成功, 返回值或错误信息)
+
+
+class DbWriteTask(QRunnable):
+    """一次性数据库写入任务；需要保持先后顺序时提交到单线程的 QThreadPool。"""
+
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        # QRunnable 不是 QObject，信号由内嵌的 QObject 发出
+        self.signals = DbWriteSignals()
+
+    def run(self):
+        try:
+            result = self.fn()
+        except Exception as e:
+            try:
+                self.signals.done.emit(False, str(e))
+            except Exception:
+                pass
+            return
+        try:
+            self.signals.done.emit(True, result)
+        except Exception:
+            pass
@@ -1,9 +1,112 @@
 # -*- coding: utf-8 -*-
 from PyQt6.QtCore import QThread, pyqtSignal
 import os
+import errno
 import json
+import shutil
+import time
+import asyncio
+import concurrent.futures
 from pathlib import Path
-import requests
+import aiohttp
+from ...core.config import Config
+from ._async_runtime import ensure_shared_loop
+
+try:
+    import orjson  # 可选依赖：带缩进序列化远快于标准库的纯 Python 路径
+except ImportError:
+    orjson = None
+
+
+def _dumps_metadata(meta: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(meta, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(meta, ensure_ascii=False, indent=2).encode('utf-8')
+
+# 单次读取块大小：较大的块减少读取往返与信号次数，又不至于让慢速连接的进度长时间不更新
+_CHUNK_SIZE = 256 * 1024
+# 进度信号最小间隔（秒）：跨线程信号会在 GUI 事件队列中排队，约 10Hz 即足够流畅
+_PROGRESS_INTERVAL = 0.1
+# 可重试的 HTTP 状态码（与原 urllib3 Retry 配置一致）
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_RETRY_BACKOFF = 0.5
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# 进程级共享下载会话：仅在共享事件循环上创建和使用，跨队列复用 TCP/TLS 连接
+_SESSION: aiohttp.ClientSession | None = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """返回共享的 aiohttp 会话；必须在共享事件循环中调用。"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        try:
+            concurrent = int(Config().get('network.concurrent_downloads', 5) or 5)
+        except Exception:
+            concurrent = 5
+        connector = aiohttp.TCPConnector(limit_per_host=max(4, concurrent))
+        _SESSION = aiohttp.ClientSession(trust_env=True, connector=connector,
+                                         headers={'User-Agent': _USER_AGENT})
+    return _SESSION
+
+
+def _proxy_for(url: str, proxies: dict | None) -> str | None:
+    """把 requests 风格的 proxies 字典转换为 aiohttp 的单个代理 URL。"""
+    if not proxies:
+        return None
+    scheme = 'https' if url.lower().startswith('https') else 'http'
+    return proxies.get(scheme) or proxies.get('http') or proxies.get('https')
+
+
+def _open_part_file(path: Path, append: bool) -> int:
+    """以原始文件描述符打开 .part 文件（无 Python 层缓冲）。续传时定位到末尾。"""
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(str(path), flags, 0o644)
+    if append:
+        os.lseek(fd, 0, os.SEEK_END)
+    return fd
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        n = os.write(fd, view)
+        view = view[n:]
+
+
+def _drop_page_cache(fd: int):
+    """下载内容不会被立即回读，提示内核释放其页缓存（仅 POSIX）。
+    不做 fsync：只释放已回写的干净页，脏页交由内核正常回写，避免每个文件一次同步刷盘。"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _finalize_part(src: Path, dst: Path):
+    """把 .part 文件移动为最终文件。跨文件系统（EXDEV）时在内核内拷贝后删除源文件。"""
+    try:
+        os.replace(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    with open(src, 'rb') as r, open(dst, 'wb') as w:
+        if hasattr(os, 'sendfile'):
+            size = os.fstat(r.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(w.fileno(), r.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        else:
+            shutil.copyfileobj(r, w, _CHUNK_SIZE)
+    os.unlink(src)
+
 
 class DownloadTask:
     def __init__(self, url: str, site: str, post_id: str, ext: str, save_dir: Path, headers: dict, proxies: dict | None,
@@ -27,77 +130,134 @@ class DownloadQueueThread(QThread):
     queue_finished = pyqtSignal()
     canceled = pyqtSignal()
 
-    def __init__(self, tasks: list[DownloadTask], auto_rename: bool, save_metadata: bool, max_retries: int):
+    def __init__(self, tasks: list[DownloadTask], auto_rename: bool, save_metadata: bool, max_retries: int,
+                 session: aiohttp.ClientSession | None = None, concurrency: int | None = None):
         super().__init__()
         self.tasks = tasks
         self.auto_rename = auto_rename
         self.save_metadata = save_metadata
         self.max_retries = max_retries
+        # 未显式注入时使用模块级共享会话（注入的会话必须属于共享事件循环）
+        self.session = session
+        if concurrency is None:
+            try:
+                concurrency = int(Config().get('network.concurrent_downloads', 5) or 5)
+            except Exception:
+                concurrency = 5
+        self.concurrency = max(1, concurrency)
         self._cancel = False
+        self._canceled_emitted = False
+        self._total_size = 0
+        self._total_written = 0
+        # 所有任务都在同一事件循环上运行，分配文件名无需加锁
+        self._reserved_paths: set[Path] = set()
 
     def cancel(self):
+        # 协作式取消：各下载协程在块之间检查标志。不直接取消 future，
+        # 以免在线程池写入尚未完成时关闭文件描述符。
         self._cancel = True
 
+    def _emit_canceled(self):
+        if self._canceled_emitted:
+            return
+        self._canceled_emitted = True
+        self.canceled.emit()
+
     def run(self):
         total_size = 0
         for t in self.tasks:
             sz = int(t.metadata.get('file_size', 0) or 0)
             if sz > 0:
                 total_size += sz
-        total_written = 0
+        self._total_size = total_size
+        self._total_written = 0
 
-        session = requests.Session()
+        loop = ensure_shared_loop()
+        fut = asyncio.run_coroutine_threadsafe(self._run_async(), loop)
         try:
-            session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'})
-        except Exception:
+            fut.result()
+        except concurrent.futures.CancelledError:
             pass
-        try:
-            from requests.adapters import HTTPAdapter
-            from urllib3.util.retry import Retry
-            retry = Retry(total=self.max_retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
-            adapter = HTTPAdapter(max_retries=retry)
-            session.mount('http://', adapter)
-            session.mount('https://', adapter)
         except Exception:
             pass
 
-        for idx, task in enumerate(self.tasks):
-            if self._cancel:
-                self.canceled.emit()
-                break
-            self.task_started.emit(idx, f"{task.site}_{task.post_id}.{task.ext}")
-            task.save_dir.mkdir(parents=True, exist_ok=True)
-            def build_filename(n: int = 0):
-                sfx = f"_{n}" if n > 0 else ""
-                return task.save_dir / f"{task.site}_{task.post_id}{sfx}.{task.ext}"
-            target_path = build_filename(0)
-            if target_path.exists() and self.auto_rename:
-                n = 1
-                while build_filename(n).exists():
-                    n += 1
-                target_path = build_filename(n)
-            temp_path = target_path.with_suffix(target_path.suffix + '.part')
-
-            headers = dict(task.headers)
-            existing_size = temp_path.stat().st_size if temp_path.exists() else 0
-            if existing_size > 0:
-                headers['Range'] = f'bytes={existing_size}-'
+        if self._cancel:
+            self._emit_canceled()
+        self.queue_finished.emit()
+
+    async def _run_async(self):
+        session = self.session or await _get_session()
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def _bounded(idx: int, task: DownloadTask):
+            async with sem:
+                await self._download_one(idx, task, session)
+
+        await asyncio.gather(*[_bounded(idx, task) for idx, task in enumerate(self.tasks)],
+                             return_exceptions=True)
+
+    async def _open_with_retry(self, session: aiohttp.ClientSession, task: DownloadTask, headers: dict):
+        """发起 GET；连接错误与可重试状态码按指数退避重试。返回未读取正文的响应。"""
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=task.timeout, sock_read=task.timeout)
+        proxy = _proxy_for(task.url, task.proxies)
+        attempt = 0
+        while True:
             try:
-                resp = session.get(task.url, headers=headers, stream=True, timeout=task.timeout, proxies=task.proxies)
-            except Exception as e:
-                self.task_finished.emit(idx, False, str(target_path), str(e))
-                continue
-            if resp.status_code == 403:
+                resp = await session.get(task.url, headers=headers, timeout=timeout, proxy=proxy)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= self.max_retries or self._cancel:
+                    raise
+            else:
+                if resp.status not in _RETRY_STATUSES or attempt >= self.max_retries or self._cancel:
+                    return resp
+                resp.release()
+            attempt += 1
+            await asyncio.sleep(_RETRY_BACKOFF * (2 ** (attempt - 1)))
+
+    async def _download_one(self, idx: int, task: DownloadTask, session: aiohttp.ClientSession):
+        if self._cancel:
+            self._emit_canceled()
+            return
+        prefix = f"{task.site}_{task.post_id}"
+        suffix = f".{task.ext}"
+        self.task_started.emit(idx, prefix + suffix)
+        save_dir = task.save_dir
+        save_dir.mkdir(parents=True, exist_ok=True)
+        target_path = save_dir / (prefix + suffix)
+        if (target_path.exists() or target_path in self._reserved_paths) and self.auto_rename:
+            n = 1
+            while True:
+                candidate = save_dir / f"{prefix}_{n}{suffix}"
+                if not candidate.exists() and candidate not in self._reserved_paths:
+                    break
+                n += 1
+            target_path = candidate
+        self._reserved_paths.add(target_path)
+        temp_path = target_path.with_name(target_path.name + '.part')
+
+        headers = dict(task.headers)
+        existing_size = temp_path.stat().st_size if temp_path.exists() else 0
+        if existing_size > 0:
+            headers['Range'] = f'bytes={existing_size}-'
+        loop = asyncio.get_running_loop()
+        try:
+            resp = await self._open_with_retry(session, task, headers)
+        except Exception as e:
+            self.task_finished.emit(idx, False, str(target_path), str(e) or type(e).__name__)
+            return
+        # 无论成功与否都释放响应，以便连接归还池中复用
+        async with resp:
+            if resp.status == 403:
                 self.task_finished.emit(idx, False, str(target_path), '403')
-                continue
+                return
             try:
                 resp.raise_for_status()
             except Exception as e:
                 self.task_finished.emit(idx, False, str(target_path), str(e))
-                continue
+                return
 
             total = None
-            if resp.status_code == 206:
+            if resp.status == 206:
                 cr = resp.headers.get('Content-Range')
                 if cr and '/' in cr:
                     try:
@@ -113,44 +273,55 @@ class DownloadQueueThread(QThread):
             if total and task.max_file_size_mb > 0:
                 if total / (1024 * 1024) > task.max_file_size_mb:
                     self.task_finished.emit(idx, False, str(target_path), 'size_limit')
-                    continue
+                    return
 
-            mode = 'ab' if existing_size > 0 and resp.status_code == 206 else 'wb'
+            append = existing_size > 0 and resp.status == 206
             written = existing_size
+            last_emit = 0.0
             try:
-                with open(temp_path, mode) as f:
-                    for chunk in resp.iter_content(chunk_size=8192):
+                fd = await loop.run_in_executor(None, _open_part_file, temp_path, append)
+                try:
+                    async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
                         if self._cancel:
-                            self.canceled.emit()
+                            self._emit_canceled()
                             break
                         if not chunk:
                             continue
-                        f.write(chunk)
+                        # 磁盘写入放到线程池，避免阻塞共享事件循环上的其它请求
+                        await loop.run_in_executor(None, _write_all, fd, chunk)
                         written += len(chunk)
+                        self._total_written += len(chunk)
+                        now = time.monotonic()
+                        if now - last_emit >= _PROGRESS_INTERVAL:
+                            last_emit = now
+                            self.task_progress.emit(idx, written, total or 0)
+                            self.overall_progress.emit(self._total_written, self._total_size)
+                    if not self._cancel:
+                        # 完成时补发最终进度，保证进度条停在 100%
                         self.task_progress.emit(idx, written, total or 0)
-                        total_written += len(chunk)
-                        self.overall_progress.emit(total_written, total_size)
+                        self.overall_progress.emit(self._total_written, self._total_size)
+                        await loop.run_in_executor(None, _drop_page_cache, fd)
+                finally:
+                    os.close(fd)
             except Exception as e:
                 self.task_finished.emit(idx, False, str(target_path), str(e))
-                continue
+                return
 
-            if self._cancel:
-                self.task_finished.emit(idx, False, str(target_path), 'canceled')
-                break
+        if self._cancel:
+            self.task_finished.emit(idx, False, str(target_path), 'canceled')
+            return
 
+        try:
+            await loop.run_in_executor(None, _finalize_part, temp_path, target_path)
+        except Exception as e:
+            self.task_finished.emit(idx, False, str(target_path), str(e))
+            return
+
+        if self.save_metadata:
+            meta_path = target_path.with_name(target_path.name + '.json')
             try:
-                temp_path.replace(target_path)
+                await loop.run_in_executor(None, meta_path.write_bytes, _dumps_metadata(task.metadata))
             except Exception:
-                os.replace(str(temp_path), str(target_path))
-
-            if self.save_metadata:
-                meta_path = target_path.with_suffix(target_path.suffix + '.json')
-                try:
-                    with open(meta_path, 'w', encoding='utf-8') as mf:
-                        json.dump(task.metadata, mf, ensure_ascii=False, indent=2)
-                except Exception:
-                    pass
-
-            self.task_finished.emit(idx, True, str(target_path), '')
+                pass
 
-        self.queue_finished.emit()
\ No newline at end of file
+        self.task_finished.emit(idx, True, str(target_path), '')
@@ -5,15 +5,18 @@
 
 from PyQt6.QtCore import QThread, pyqtSignal
 import asyncio
+import atexit
 import aiohttp
-import threading
 import concurrent.futures
+import functools
 import socket
 import time
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from ...core.config import Config
+from ._async_runtime import ensure_shared_loop
 
 
+@functools.lru_cache(maxsize=16)
 def _site_probe_target(site: str) -> Tuple[str, str]:
     """返回 (主机, 诊断URL)。均为无需登录的最小可用接口。
     """
@@ -30,22 +33,56 @@ def _site_probe_target(site: str) -> Tuple[str, str]:
     return ('danbooru.donmai.us', 'https://danbooru.donmai.us/posts.json?limit=1')
 
 
-_SHARED_LOOP = None
-_SHARED_THREAD = None
+# DNS 结果缓存：主机 -> (解析时间, IP 列表)。诊断目标只有少数几个站点
+_DNS_TTL = 60.0
+_DNS_CACHE: Dict[str, Tuple[float, List[str]]] = {}
+
+
+def _cached_getaddrinfo(host: str) -> List[str]:
+    """解析主机并返回排序后的 IP 列表；TTL 内直接复用缓存结果。"""
+    now = time.monotonic()
+    hit = _DNS_CACHE.get(host)
+    if hit and now - hit[0] < _DNS_TTL:
+        return hit[1]
+    info = socket.getaddrinfo(host, None)
+    ip_list = sorted({i[4][0] for i in info if i and i[4]})
+    _DNS_CACHE[host] = (now, ip_list)
+    return ip_list
+
+
+def clear_dns_cache(host: Optional[str] = None):
+    """清除 DNS 缓存；指定 host 时仅清除该主机。"""
+    if host is None:
+        _DNS_CACHE.clear()
+    else:
+        _DNS_CACHE.pop(host, None)
+
+
+# 诊断共用的 HTTP 会话：仅在共享事件循环上创建和使用
+_HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def _get_http_session() -> aiohttp.ClientSession:
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            trust_env=True,
+            connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=60),
+        )
+    return _HTTP_SESSION
+
+
+@atexit.register
+def _close_http_session():
+    sess = _HTTP_SESSION
+    if sess is None or sess.closed:
+        return
+    try:
+        fut = asyncio.run_coroutine_threadsafe(sess.close(), ensure_shared_loop())
+        fut.result(timeout=2.0)
+    except Exception:
+        pass
 
-def _ensure_shared_loop():
-    global _SHARED_LOOP, _SHARED_THREAD
-    if _SHARED_LOOP and _SHARED_THREAD and _SHARED_THREAD.is_alive():
-        return _SHARED_LOOP
-    loop = asyncio.new_event_loop()
-    def _runner():
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-    t = threading.Thread(target=_runner, name="FalconPyAsyncLoop", daemon=True)
-    t.start()
-    _SHARED_LOOP = loop
-    _SHARED_THREAD = t
-    return loop
 
 class NetworkDiagnosticsThread(QThread):
     """执行单站点网络诊断的线程。"""
@@ -81,8 +118,7 @@ class NetworkDiagnosticsThread(QThread):
 
         # 步骤1：DNS解析
         try:
-            info = socket.getaddrinfo(host, None)
-            ip_list = sorted({i[4][0] for i in info if i and i[4]})
+            ip_list = _cached_getaddrinfo(host)
             ip_text = ', '.join(ip_list[:3]) + ("..." if len(ip_list) > 3 else "")
             details.append(f"DNS解析: 成功 -> {ip_text}")
         except Exception as e:
@@ -93,19 +129,21 @@ class NetworkDiagnosticsThread(QThread):
         # 步骤2：HTTP访问
         async def _http_probe():
             timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                t0 = time.perf_counter()
-                async with session.get(url, timeout=timeout, proxy=proxy_url) as resp:
-                    content_type = resp.headers.get('content-type', '')
-                    # 尝试读取少量文本以验证响应（不强制JSON）
-                    text = await resp.text()
-                    elapsed = time.perf_counter() - t0
-                    details.append(f"HTTP状态: {resp.status} {resp.reason}")
-                    details.append(f"内容类型: {content_type}")
-                    details.append(f"响应大小: {len(text)}")
-                    details.append(f"耗时: {elapsed:.3f}s")
-
-        loop = _ensure_shared_loop()
+            session = await _get_http_session()
+            t0 = time.perf_counter()
+            # 关闭压缩，使响应大小与 Content-Length 一致
+            headers = {'Accept-Encoding': 'identity'}
+            async with session.get(url, timeout=timeout, proxy=proxy_url, headers=headers) as resp:
+                content_type = resp.headers.get('content-type', '')
+                # 读取原始字节以验证响应（无需解码文本）
+                raw = await resp.read()
+                elapsed = time.perf_counter() - t0
+                details.append(f"HTTP状态: {resp.status} {resp.reason}")
+                details.append(f"内容类型: {content_type}")
+                details.append(f"响应大小: {len(raw)}")
+                details.append(f"耗时: {elapsed:.3f}s")
+
+        loop = ensure_shared_loop()
         try:
             fut = asyncio.run_coroutine_threadsafe(_http_probe(), loop)
             fut.result()
@@ -114,6 +152,8 @@ class NetworkDiagnosticsThread(QThread):
             details.append(f"TLS证书错误: {type(e).__name__} - {e}")
             self.failed.emit("\n".join(details))
         except aiohttp.ClientConnectorError as e:
+            # 连接失败可能源于过期的解析结果，下次诊断重新解析
+            clear_dns_cache(host)
             details.append(f"连接错误: {type(e).__name__} - {e}")
             self.failed.emit("\n".join(details))
         except aiohttp.ClientResponseError as e:
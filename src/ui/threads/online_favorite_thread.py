@@ -1,46 +1,60 @@
 # -*- coding: utf-8 -*-
 """
-在线收藏操作线程：在后台执行添加/移除收藏，避免阻塞 UI。
+在线收藏操作任务：在线程池中执行添加/移除收藏，避免阻塞 UI。
 目前支持 Danbooru。
 """
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+import asyncio
+import concurrent.futures
 
+from ._async_runtime import PendingFutures, ensure_shared_loop
 
-class OnlineFavoriteOpThread(QThread):
+
+class OnlineFavoriteOpSignals(QObject):
     finished_ok = pyqtSignal(bool)  # True 表示成功
     error = pyqtSignal(str)
 
+
+class OnlineFavoriteOpTask(QRunnable):
+    """一次性收藏操作任务，提交到 QThreadPool.globalInstance() 执行。"""
+
     def __init__(self, api_manager, site: str, op: str, post_id: str):
         super().__init__()
         self.api_manager = api_manager
         self.site = site
         self.op = op  # 'add' | 'remove'
         self.post_id = post_id
-        self._loop = None
+        self.signals = OnlineFavoriteOpSignals()
+        self._futures = PendingFutures()
+        self._cancelled = False
+
+    def cancel(self):
+        """请求中断并取消正在运行的异步任务。"""
+        self._cancelled = True
+        self._futures.cancel()
 
     def run(self):
-        import asyncio
+        async def _do():
+            if self.op == 'add':
+                return await self.api_manager.add_favorite(self.site, self.post_id)
+            elif self.op == 'remove':
+                return await self.api_manager.remove_favorite(self.site, self.post_id)
+            return False
+
         try:
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-
-            async def _do():
-                if self.op == 'add':
-                    return await self.api_manager.add_favorite(self.site, self.post_id)
-                elif self.op == 'remove':
-                    return await self.api_manager.remove_favorite(self.site, self.post_id)
-                return False
-
-            ok = self._loop.run_until_complete(_do())
-            self.finished_ok.emit(bool(ok))
+            loop = ensure_shared_loop()
+            if self._cancelled:
+                return
+            fut = asyncio.run_coroutine_threadsafe(_do(), loop)
+            self._futures.add(fut)
+            try:
+                ok = fut.result()
+            except concurrent.futures.CancelledError:
+                return
+            self.signals.finished_ok.emit(bool(ok))
         except Exception as e:
-            self.error.emit(str(e))
+            if not self._cancelled:
+                self.signals.error.emit(str(e))
         finally:
-            try:
-                if self._loop:
-                    self._loop.run_until_complete(asyncio.sleep(0))
-                    self._loop.close()
-            except Exception:
-                pass
-            self._loop = None
\ No newline at end of file
+            self._futures.clear()
@@ -1,18 +1,25 @@
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
 
-class UpdateCheckThread(QThread):
+
+class UpdateCheckSignals(QObject):
     done = pyqtSignal(dict)
 
+
+class UpdateCheckTask(QRunnable):
+    """一次性更新检查任务，提交到 QThreadPool.globalInstance() 执行。"""
+
     def __init__(self, update_manager):
         super().__init__()
         self.update_manager = update_manager
+        # QRunnable 不是 QObject，信号由内嵌的 QObject 发出
+        self.signals = UpdateCheckSignals()
 
     def run(self):
         try:
             info = self.update_manager.check_now()
-            self.done.emit(info or {})
+            self.signals.done.emit(info or {})
         except Exception:
             try:
-                self.done.emit({"has_update": False, "latest_version": None, "download_url": None, "notes_url": None, "message": "error"})
+                self.signals.done.emit({"has_update": False, "latest_version": None, "download_url": None, "notes_url": None, "message": "error"})
             except Exception:
-                pass
\ No newline at end of file
+                pass
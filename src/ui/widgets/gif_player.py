@@ -5,12 +5,192 @@ GIF播放器组件
 """
 
 import io
+import time
+import hashlib
+from collections import OrderedDict
 from typing import List, Optional, Callable
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtCore import (QObject, QRunnable, QThreadPool, QTimer, QBuffer, QByteArray, QIODevice,
+                          Qt, pyqtSignal)
+from PyQt6.QtGui import QPixmap, QImage, QMovie
 from PIL import Image, ImageSequence
 
 
+# 已解码帧的进程级 LRU 缓存：内容摘要 -> ((帧元组, 持续时间元组, 循环次数), 像素字节数)
+# 仅在 GUI 线程读写；QPixmap 为隐式共享，多个播放器共用同一组帧是安全的
+# 缓存是帧内存的唯一长期持有者，除条目数外还按像素总量限额，淘汰后内存即释放
+_GIF_CACHE: "OrderedDict[bytes, tuple]" = OrderedDict()
+_GIF_CACHE_MAX = 16
+_GIF_CACHE_MAX_BYTES = 192 * 1024 * 1024
+_gif_cache_bytes = 0
+
+# 全部帧展开为 ARGB32 后超过该大小的 GIF 改由 QMovie 流式解码，只驻留当前帧
+_STREAM_THRESHOLD_BYTES = 256 * 1024 * 1024
+# 后台解码返回该标记表示应走 QMovie 流式播放
+_STREAM = object()
+
+
+def _gif_cache_put(key: bytes, entry) -> None:
+    """写入缓存并按条目数/像素总量淘汰最久未用的条目；单个超限的条目不缓存"""
+    global _gif_cache_bytes
+    # 共享的帧只计一次
+    unique = {pixmap.cacheKey(): pixmap for pixmap in entry[0]}
+    nbytes = sum(p.width() * p.height() * max(1, p.depth() // 8) for p in unique.values())
+    old = _GIF_CACHE.pop(key, None)
+    if old is not None:
+        _gif_cache_bytes -= old[1]
+    if nbytes > _GIF_CACHE_MAX_BYTES:
+        return
+    _GIF_CACHE[key] = (entry, nbytes)
+    _gif_cache_bytes += nbytes
+    while _GIF_CACHE and (len(_GIF_CACHE) > _GIF_CACHE_MAX or _gif_cache_bytes > _GIF_CACHE_MAX_BYTES):
+        _, (_, evicted) = _GIF_CACHE.popitem(last=False)
+        _gif_cache_bytes -= evicted
+
+
+def _gif_cache_key(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _pil_to_qimage(pil_image: Image.Image):
+    """
+    将PIL图像转换为QImage（可在工作线程调用）
+
+    Args:
+        pil_image: PIL图像对象，调用方须保证为RGBA模式
+
+    Returns:
+        (QImage, bytes): QImage 直接引用 bytes 不拷贝，转换为 QPixmap 前须一并持有
+    """
+    # 获取图像数据：按 BGRA 字节序导出，对应 QImage 的 ARGB32（与 PIL.ImageQt 相同），
+    # 比 RGBA8888 少一次 fromImage 内部的通道重排
+    width, height = pil_image.size
+    img_data = pil_image.tobytes('raw', 'BGRA')
+
+    # 创建QImage：直接引用 img_data 不拷贝，显式给出每行字节数
+    qimage = QImage(img_data, width, height, width * 4, QImage.Format.Format_ARGB32)
+    return qimage, img_data
+
+
+def _frame_to_qimage(frame: Image.Image):
+    """
+    将GIF帧转换为QImage：无透明色的调色板/灰度/RGB帧存为 RGB16（2 字节/像素），
+    其余转为 RGBA 走 ARGB32
+
+    Returns:
+        (QImage, bytes 或 None): 同 _pil_to_qimage
+    """
+    if frame.mode in ('P', 'L', 'RGB') and 'transparency' not in frame.info:
+        rgb = frame if frame.mode == 'RGB' else frame.convert('RGB')
+        width, height = rgb.size
+        img_data = rgb.tobytes('raw', 'RGB')
+        qimage = QImage(img_data, width, height, width * 3, QImage.Format.Format_RGB888)
+        # convertToFormat 生成自持数据的新图像，img_data 随即可释放
+        return qimage.convertToFormat(QImage.Format.Format_RGB16), None
+
+    # 转换为RGBA模式以确保透明度支持（已是RGBA则跳过）
+    if frame.mode != 'RGBA':
+        frame = frame.convert('RGBA')
+    return _pil_to_qimage(frame)
+
+
+def _extract_frames_worker(data: bytes, default_duration: int):
+    """
+    解码GIF的所有帧（在工作线程中执行，只产出 QImage，QPixmap 须在 GUI 线程创建）
+
+    Returns:
+        (帧列表[(QImage, bytes)], 帧持续时间列表, 循环次数)；
+        展开后过大时返回 _STREAM
+    """
+    with Image.open(io.BytesIO(data)) as gif_image:
+        # 检查是否为动画GIF
+        if not getattr(gif_image, 'is_animated', False):
+            # 静态图片，只有一帧
+            return [_frame_to_qimage(gif_image)], [0], 1
+
+        # 按帧数预分配，避免逐帧 append 扩容
+        n = max(1, getattr(gif_image, 'n_frames', 1))
+        width, height = gif_image.size
+        if width * height * 4 * n > _STREAM_THRESHOLD_BYTES:
+            return _STREAM
+        frames = [None] * n
+        durations = [0] * n
+        count = 0
+        first_raw = prev_raw = None
+
+        for i, frame in enumerate(ImageSequence.Iterator(gif_image)):
+            if i >= n:
+                break
+            # 获取帧持续时间
+            duration = frame.info.get('duration', default_duration)
+            if duration <= 0:
+                duration = default_duration
+
+            # Pillow 已按处置方式把每帧的变化区域合成到画布上；与上一帧像素完全相同时
+            # （静止尾帧、空增量帧）直接共享上一帧，不占用新内存
+            raw = _frame_to_qimage(frame)
+            if prev_raw is not None and raw[0] == prev_raw[0]:
+                frames[i] = frames[i - 1]
+            else:
+                frames[i] = raw
+            if first_raw is None:
+                first_raw = raw
+            prev_raw = raw
+            durations[i] = duration
+            count = i + 1
+
+        # n_frames 与实际可读帧数不一致时截断
+        if count < n:
+            del frames[count:]
+            del durations[count:]
+
+        # 末帧与首帧相同（回弹/静止结尾）时共享首帧，循环回绕时无需重复发送
+        if count > 1 and frames[-1] is not frames[0] and prev_raw[0] == first_raw[0]:
+            frames[-1] = frames[0]
+
+        # 获取循环次数
+        loop_count = getattr(gif_image, 'loop', 0)
+        return frames, durations, loop_count
+
+
+def _qimage_to_qpixmap(qimage: QImage) -> QPixmap:
+    """QImage 转 QPixmap（GUI 线程）：RGB16 帧保持 16 位存储，不提升为 32 位"""
+    if qimage.format() == QImage.Format.Format_RGB16:
+        return QPixmap.fromImage(qimage, Qt.ImageConversionFlag.NoFormatConversion)
+    return QPixmap.fromImage(qimage)
+
+
+class _GifDecodeSignals(QObject):
+    done = pyqtSignal(int, object)   # (加载序号, (帧列表, 持续时间列表, 循环次数))
+    failed = pyqtSignal(int, str)    # (加载序号, 错误信息)
+
+
+class _GifDecodeTask(QRunnable):
+    """一次性GIF解码任务，提交到 QThreadPool.globalInstance() 执行。"""
+
+    def __init__(self, seq: int, data: bytes, default_duration: int, signals: _GifDecodeSignals):
+        super().__init__()
+        self.seq = seq
+        self.data = data
+        self.default_duration = default_duration
+        # QRunnable 不是 QObject，信号由播放器持有的 QObject 发出
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = _extract_frames_worker(self.data, self.default_duration)
+        except Exception as e:
+            try:
+                self.signals.failed.emit(self.seq, str(e))
+            except RuntimeError:
+                # 播放器已销毁
+                pass
+            return
+        try:
+            self.signals.done.emit(self.seq, result)
+        except RuntimeError:
+            pass
+
+
 class GifPlayer(QObject):
     """
     高性能GIF播放器
@@ -20,18 +200,39 @@ class GifPlayer(QObject):
     # 信号
     frame_changed = pyqtSignal(QPixmap)  # 帧变化信号
     playback_finished = pyqtSignal()     # 播放完成信号
+    frames_ready = pyqtSignal()          # 后台解码完成，帧可用
+    load_failed = pyqtSignal(str)        # 后台解码失败
     
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # 播放控制
         self.timer = QTimer(self)
+        # 精确定时器 + 按累计截止时间计算下一次延迟，避免逐帧误差累积
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self._next_frame)
+        self._next_deadline = 0.0
         
+        # 后台解码：序号用于丢弃过期结果
+        self._load_seq = 0
+        self._load_key = None
+        self._load_data = None
+        self._loading = False
+
+        # 超大 GIF 的流式播放
+        self._movie: Optional[QMovie] = None
+        self._movie_buffer: Optional[QBuffer] = None
+        self._play_pending = False
+        self._decode_signals = _GifDecodeSignals(self)
+        self._decode_signals.done.connect(self._on_frames_decoded)
+        self._decode_signals.failed.connect(self._on_decode_failed)
+
         # GIF数据
-        self.gif_image: Optional[Image.Image] = None
         self.frames: List[QPixmap] = []
         self.frame_durations: List[int] = []
+        # 各帧的 cacheKey：相同像素的帧共享同一 QPixmap，键相同时无需重复发送
+        self._frame_keys: List[int] = []
+        self._last_emitted_key = None
         
         # 播放状态
         self.current_frame = 0
@@ -45,13 +246,13 @@ class GifPlayer(QObject):
         
     def load_gif(self, data: bytes) -> bool:
         """
-        加载GIF数据
+        加载GIF数据：帧在线程池中解码，完成后发出 frames_ready（失败发出 load_failed）
         
         Args:
             data: GIF文件的字节数据
             
         Returns:
-            bool: 加载是否成功
+            bool: 解码任务是否已提交
         """
         try:
             # 停止当前播放
@@ -60,27 +261,25 @@ class GifPlayer(QObject):
             # 清空之前的数据
             self._clear_data()
             
-            # 使用PIL打开GIF
-            gif_io = io.BytesIO(data)
-            self.gif_image = Image.open(gif_io)
+            if not data:
+                return False
             
-            # 检查是否为动画GIF
-            if not getattr(self.gif_image, 'is_animated', False):
-                # 静态图片，只有一帧
-                frame_pixmap = self._pil_to_qpixmap(self.gif_image)
-                self.frames = [frame_pixmap]
-                self.frame_durations = [0]
-                self.total_frames = 1
-                self.loop_count = 1
+            self._load_seq += 1
+            self._loading = True
+            self._load_key = _gif_cache_key(data)
+            self._load_data = data
+
+            # 命中缓存：跳过解码，下一轮事件循环再通知，与后台解码路径保持一致的时序
+            cached = _GIF_CACHE.get(self._load_key)
+            if cached is not None:
+                _GIF_CACHE.move_to_end(self._load_key)
+                seq = self._load_seq
+                entry = cached[0]
+                QTimer.singleShot(0, lambda: self._apply_frames(seq, entry))
                 return True
-            
-            # 提取所有帧
-            self._extract_frames()
-            
-            # 获取循环次数
-            self.loop_count = getattr(self.gif_image, 'loop', 0)
-            
-            print(f"[GIF] 加载成功: {self.total_frames}帧, 循环次数: {self.loop_count}")
+
+            task = _GifDecodeTask(self._load_seq, data, self.default_duration, self._decode_signals)
+            QThreadPool.globalInstance().start(task)
             return True
             
         except Exception as e:
@@ -88,55 +287,127 @@ class GifPlayer(QObject):
             self._clear_data()
             return False
     
-    def _extract_frames(self):
-        """提取GIF的所有帧"""
-        self.frames = []
-        self.frame_durations = []
-        
-        for frame in ImageSequence.Iterator(self.gif_image):
-            # 转换为RGBA模式以确保透明度支持
-            if frame.mode != 'RGBA':
-                frame = frame.convert('RGBA')
-            
-            # 转换为QPixmap
-            pixmap = self._pil_to_qpixmap(frame)
-            self.frames.append(pixmap)
-            
-            # 获取帧持续时间
-            duration = frame.info.get('duration', self.default_duration)
-            if duration <= 0:
-                duration = self.default_duration
-            self.frame_durations.append(duration)
-        
+    def _on_frames_decoded(self, seq: int, result):
+        """解码完成（GUI 线程）：QImage 转为 QPixmap"""
+        if seq != self._load_seq:
+            return
+        if result is _STREAM:
+            self._start_movie(seq)
+            return
+        images, durations, loop_count = result
+        try:
+            # 共享的帧只转换一次，得到同一个 QPixmap
+            converted = {}
+            pixmaps = []
+            for frame in images:
+                pixmap = converted.get(id(frame))
+                if pixmap is None:
+                    pixmap = converted[id(frame)] = _qimage_to_qpixmap(frame[0])
+                pixmaps.append(pixmap)
+            frames = tuple(pixmaps)
+        except Exception as e:
+            self._on_decode_failed(seq, str(e))
+            return
+        if not frames:
+            self._on_decode_failed(seq, "no frames")
+            return
+        entry = (frames, tuple(durations), loop_count)
+        if self._load_key is not None:
+            _gif_cache_put(self._load_key, entry)
+        self._apply_frames(seq, entry)
+
+    def _apply_frames(self, seq: int, entry):
+        """装载已解码的帧（来自后台解码或缓存）"""
+        if seq != self._load_seq:
+            return
+        self._loading = False
+        self._load_data = None
+        frames, durations, loop_count = entry
+        self.frames = list(frames)
+        self._frame_keys = [pixmap.cacheKey() for pixmap in self.frames]
+        self.frame_durations = list(durations)
         self.total_frames = len(self.frames)
-        print(f"[GIF] 提取了 {self.total_frames} 帧")
-    
-    def _pil_to_qpixmap(self, pil_image: Image.Image) -> QPixmap:
-        """
-        将PIL图像转换为QPixmap
+        self.loop_count = loop_count
         
-        Args:
-            pil_image: PIL图像对象
-            
-        Returns:
-            QPixmap: Qt像素图
-        """
-        # 确保图像为RGBA模式
-        if pil_image.mode != 'RGBA':
-            pil_image = pil_image.convert('RGBA')
-        
-        # 获取图像数据
-        width, height = pil_image.size
-        img_data = pil_image.tobytes('raw', 'RGBA')
-        
-        # 创建QImage
-        qimage = QImage(img_data, width, height, QImage.Format.Format_RGBA8888)
-        
-        # 转换为QPixmap
-        return QPixmap.fromImage(qimage)
+        print(f"[GIF] 加载成功: {self.total_frames}帧, 循环次数: {self.loop_count}")
+        self.frames_ready.emit()
+        if self._play_pending:
+            self._play_pending = False
+            self.play()
+
+    def _start_movie(self, seq: int):
+        """帧过多时改用 QMovie：按需解码，内存只保留当前帧"""
+        data = self._load_data
+        self._loading = False
+        self._load_data = None
+        buffer = QBuffer(self)
+        buffer.setData(QByteArray(data or b''))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        movie = QMovie(buffer, QByteArray(b'gif'), self)
+        movie.setCacheMode(QMovie.CacheMode.CacheNone)
+        if not movie.isValid() or not movie.jumpToFrame(0):
+            movie.deleteLater()
+            buffer.deleteLater()
+            self._on_decode_failed(seq, "QMovie 无法解析")
+            return
+        movie.frameChanged.connect(self._on_movie_frame)
+        movie.finished.connect(self._on_movie_finished)
+        self._movie = movie
+        self._movie_buffer = buffer
+        self.total_frames = movie.frameCount()
+        self.loop_count = movie.loopCount()
+
+        print(f"[GIF] 帧数据过大，改为流式播放: {self.total_frames}帧")
+        self.frames_ready.emit()
+        if self._play_pending:
+            self._play_pending = False
+            self.play()
+
+    def _on_movie_frame(self, index: int):
+        if self._movie is None or not self.is_playing:
+            return
+        self.current_frame = index
+        self.frame_changed.emit(self._movie.currentPixmap())
+
+    def _on_movie_finished(self):
+        self.is_playing = False
+        self.playback_finished.emit()
+        print("[GIF] 播放完成")
+
+    def _release_movie(self):
+        if self._movie is not None:
+            try:
+                self._movie.stop()
+                self._movie.deleteLater()
+            except RuntimeError:
+                pass
+            self._movie = None
+        if self._movie_buffer is not None:
+            try:
+                self._movie_buffer.close()
+                self._movie_buffer.deleteLater()
+            except RuntimeError:
+                pass
+            self._movie_buffer = None
+
+    def _on_decode_failed(self, seq: int, error: str):
+        """解码失败（GUI 线程）"""
+        if seq != self._load_seq:
+            return
+        print(f"[GIF] 加载失败: {error}")
+        self._clear_data()
+        self.load_failed.emit(error)
     
     def play(self):
-        """开始播放"""
+        """开始播放（帧尚在解码时，解码完成后自动开始）"""
+        if self._loading:
+            self._play_pending = True
+            return
+        if self._movie is not None:
+            if not self.is_playing:
+                self.is_playing = True
+                self._movie.start()
+            return
         if not self.frames or self.is_playing:
             return
         
@@ -147,6 +418,7 @@ class GifPlayer(QObject):
         # 发送第一帧
         if self.frames:
             self.frame_changed.emit(self.frames[0])
+            self._last_emitted_key = self._frame_keys[0] if self._frame_keys else None
         
         # 如果只有一帧，不需要定时器
         if self.total_frames <= 1:
@@ -154,14 +426,22 @@ class GifPlayer(QObject):
         
         # 启动定时器
         duration = self.frame_durations[0]
+        self._next_deadline = time.monotonic() + duration / 1000.0
         self.timer.start(duration)
         
         print(f"[GIF] 开始播放，首帧延迟: {duration}ms")
     
     def stop(self):
-        """停止播放"""
+        """停止播放（同时作废尚未完成的解码）"""
         if self.timer.isActive():
             self.timer.stop()
+        if self._loading:
+            self._load_seq += 1
+            self._loading = False
+            self._load_data = None
+        if self._movie is not None:
+            self._movie.stop()
+        self._play_pending = False
         self.is_playing = False
         self.current_frame = 0
         self.current_loop = 0
@@ -170,13 +450,22 @@ class GifPlayer(QObject):
         """暂停播放"""
         if self.timer.isActive():
             self.timer.stop()
+        if self._movie is not None and self._movie.state() == QMovie.MovieState.Running:
+            self._movie.setPaused(True)
+        self._play_pending = False
         self.is_playing = False
     
     def resume(self):
         """恢复播放"""
+        if self._movie is not None:
+            if not self.is_playing and self._movie.state() == QMovie.MovieState.Paused:
+                self.is_playing = True
+                self._movie.setPaused(False)
+            return
         if not self.is_playing and self.frames and self.total_frames > 1:
             self.is_playing = True
             duration = self.frame_durations[self.current_frame]
+            self._next_deadline = time.monotonic() + duration / 1000.0
             self.timer.start(duration)
     
     def _next_frame(self):
@@ -203,16 +492,25 @@ class GifPlayer(QObject):
             self.current_frame = 0
             print(f"[GIF] 开始第 {self.current_loop + 1} 次循环")
         
-        # 发送当前帧
-        current_pixmap = self.frames[self.current_frame]
-        self.frame_changed.emit(current_pixmap)
+        # 发送当前帧（与上次发送的是同一图像时跳过，省去接收方一次重绘）
+        key = self._frame_keys[self.current_frame] if self._frame_keys else None
+        if key is None or key != self._last_emitted_key:
+            self.frame_changed.emit(self.frames[self.current_frame])
+            self._last_emitted_key = key
         
-        # 设置下一帧的定时器
+        # 设置下一帧的定时器：以截止时间为准自我校正漂移
         duration = self.frame_durations[self.current_frame]
-        self.timer.start(duration)
+        now = time.monotonic()
+        self._next_deadline += duration / 1000.0
+        if self._next_deadline < now:
+            # 下一帧的截止时间已过（如事件循环被阻塞）时重新对齐，避免连续追帧
+            self._next_deadline = now + duration / 1000.0
+        self.timer.start(max(0, int((self._next_deadline - now) * 1000)))
     
     def get_current_frame(self) -> Optional[QPixmap]:
         """获取当前帧"""
+        if self._movie is not None:
+            return self._movie.currentPixmap()
         if self.frames and 0 <= self.current_frame < len(self.frames):
             return self.frames[self.current_frame]
         return None
@@ -227,12 +525,11 @@ class GifPlayer(QObject):
     
     def _clear_data(self):
         """清空数据"""
-        if self.gif_image:
-            self.gif_image.close()
-            self.gif_image = None
-        
-        self.frames.clear()
-        self.frame_durations.clear()
+        self._release_movie()
+        self.frames = []
+        self._frame_keys = []
+        self._last_emitted_key = None
+        self.frame_durations = []
         self.current_frame = 0
         self.total_frames = 0
         self.loop_count = 0
@@ -3,10 +3,10 @@
 图片网格组件
 """
 
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QScrollArea, QFrame, QSizePolicy, QMenu)
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer
-from PyQt6.QtGui import QPixmap, QPainter, QBrush, QColor, QResizeEvent, QGuiApplication
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QEvent
+from PyQt6.QtGui import QPixmap, QPixmapCache, QPainter, QBrush, QColor, QResizeEvent, QGuiApplication
 from .image_loader import ImageLoader
 from .thumbnail import ImageThumbnail
 from .thumbnail_cache import ThumbnailCache
@@ -27,6 +27,8 @@ class ImageGridWidget(QWidget):
     def __init__(self, cache_manager: CacheManager = None, i18n: I18n = None, use_advanced_cache: bool = True, use_event_manager: bool = True):
         super().__init__()
         self.images = []
+        self._image_urls = []  # 与 images 对齐的首选缩略图URL（可能为 None）
+        self._image_keys = []  # 与 images 对齐的图片键
         self.current_page = 1
         self.total_pages = 1
         self.columns = 4  # 默认列数
@@ -36,8 +38,40 @@ class ImageGridWidget(QWidget):
         self.selected_image = None  # 当前选中的图片
         self.selected_thumbnail = None  # 当前选中的缩略图组件
         
+        # 缩略图像素图在翻页之间保留在进程内的 QPixmapCache 中（单位 KB）
+        try:
+            QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), 100 * 1024))
+        except Exception:
+            pass
+        
         # 缩略图组件缓存
-        self.thumbnail_widgets = []  # 缓存的缩略图组件列表
+        self.thumbnail_widgets = []  # 当前已绑定图片的缩略图组件（按图片索引排序）
+        
+        # 虚拟化网格：只为可视行及上下预载带实例化缩略图，离开可视区的组件回收复用
+        self._slot_widgets = {}  # 图片索引 -> 绑定的缩略图组件
+        self._free_thumbnails = []  # 已隐藏、等待复用的缩略图组件
+        self._preload_rows = 1  # 可视区上下额外保留的行数
+        self._bound_range = None  # 上次同步的 (起始索引, 结束索引)
+        self._layout_signature = None  # 上次同步时的 (列数, 列宽, 行高)
+        self._url_index = {}  # 图片键（即请求的URL）-> 绑定该图片的缩略图组件列表
+        self._preloaded_urls = set()  # 本页已提交给加载器的URL，避免滚动时重复入队
+        
+        # 加载完成的缩略图按帧（16ms）批量交付
+        self._pending_loads = {}  # url -> QPixmap，保持到达顺序
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_loaded)
+        
+        # 空闲时预先创建缩略图组件放入空闲池，翻页时只需绑定数据
+        self._prewarm_timer = QTimer()
+        self._prewarm_timer.setSingleShot(True)
+        self._prewarm_timer.timeout.connect(self._prewarm_pool)
+        self._prewarm_batch = 4
+        self.grid_spacing = 10
+        self.grid_margin = 10
+        self._viewport_h = 0  # 视口高度，随视口 Resize 事件更新
+        self._canvas_height = -1  # 当前画布高度
+        self._update_geometry_cache()
         
         # 事件管理器
         self.event_manager = None
@@ -54,6 +88,8 @@ class ImageGridWidget(QWidget):
 
         # 滚动状态与降质缩放
         self.is_scrolling = False
+        self._last_scroll_y = -1  # 上次处理滚动时的纵向位置
+        self._scroll_paused = False  # 本次滚动是否已暂停加载器
         self.scroll_settle_timer = QTimer()
         self.scroll_settle_timer.setSingleShot(True)
         self.scroll_settle_timer.timeout.connect(self._on_scroll_settled)
@@ -103,28 +139,19 @@ class ImageGridWidget(QWidget):
             self.image_loader.image_loaded.connect(self.on_image_loaded)
             self.image_loader.load_failed.connect(self.on_image_failed)
         
-        from PyQt6.QtCore import QTimer as _QTmr
-        self._recreate_timer = _QTmr()
-        self._recreate_timer.setSingleShot(False)
-        self._recreate_timer.timeout.connect(self._recreate_step)
-        self._recreate_index = 0
-        try:
-            from ...core.config import Config as _Cfg2
-            _c2 = _Cfg2()
-            self._recreate_batch_size = int(_c2.get('appearance.grid_batch_size', 12) or 12)
-        except Exception:
-            self._recreate_batch_size = 12
         self.setup_ui()
+        self._prewarm_timer.start(0)
     
     def _connect_event_manager(self):
         """连接事件管理器的信号"""
         if self.event_manager:
-            self.event_manager.thumbnail_clicked.connect(self._on_event_thumbnail_clicked)
-            self.event_manager.thumbnail_double_clicked.connect(self._on_event_thumbnail_double_clicked)
-            self.event_manager.thumbnail_hovered.connect(self._on_event_thumbnail_hovered)
-            self.event_manager.thumbnail_unhovered.connect(self._on_event_thumbnail_unhovered)
-            self.event_manager.thumbnail_selected.connect(self._on_event_thumbnail_selected)
-            self.event_manager.thumbnail_favorite_toggled.connect(self._on_event_thumbnail_favorite_toggled)
+            # 事件管理器与网格同在 GUI 线程，显式直连，回调在发射处同步执行
+            direct = Qt.ConnectionType.DirectConnection
+            self.event_manager.thumbnail_clicked.connect(self._on_event_thumbnail_clicked, direct)
+            self.event_manager.thumbnail_double_clicked.connect(self._on_event_thumbnail_double_clicked, direct)
+            self.event_manager.thumbnail_selected.connect(self._on_event_thumbnail_selected, direct)
+            self.event_manager.thumbnail_favorite_toggled.connect(self._on_event_thumbnail_favorite_toggled, direct)
+            # 不连接悬停信号：悬停跟踪默认关闭，需要时调用 event_manager.enable_hover_tracking()
     
     def setup_ui(self):
         """设置UI"""
@@ -137,10 +164,8 @@ class ImageGridWidget(QWidget):
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         
-        # 网格容器
+        # 网格容器：不使用布局，缩略图按行列绝对定位，高度模拟完整画布
         self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout(self.grid_widget)
-        self.grid_layout.setSpacing(10)
 
         # 为网格容器启用自定义右键菜单
         try:
@@ -151,6 +176,11 @@ class ImageGridWidget(QWidget):
         
         self.scroll_area.setWidget(self.grid_widget)
         layout.addWidget(self.scroll_area)
+        try:
+            self.scroll_area.viewport().installEventFilter(self)
+            self.grid_widget.installEventFilter(self)
+        except Exception:
+            pass
         try:
             vs = self.scroll_area.verticalScrollBar()
             hs = self.scroll_area.horizontalScrollBar()
@@ -191,23 +221,38 @@ class ImageGridWidget(QWidget):
             # 使用定时器延迟更新，避免频繁重绘（防抖机制）
             self.resize_timer.start(self.resize_debounce_delay)
     
+    def eventFilter(self, obj, event):
+        """视口尺寸或画布宽度变化时重新计算可视带与各列位置"""
+        try:
+            if event.type() == QEvent.Type.Resize:
+                if obj is self.scroll_area.viewport():
+                    self._viewport_h = event.size().height()
+                    self._update_visible_thumbnails()
+                elif obj is self.grid_widget and event.size().width() != event.oldSize().width():
+                    self._update_geometry_cache()
+                    self._update_visible_thumbnails()
+        except Exception:
+            pass
+        return super().eventFilter(obj, event)
+    
     def calculate_optimal_columns(self, width: int) -> int:
         """根据宽度计算最优列数"""
-        # 计算单个缩略图的总宽度（包括边距和间距）
-        thumbnail_width = self.thumbnail_size[0] + 20  # 缩略图宽度 + 边框
-        spacing = self.grid_layout.spacing()  # 网格间距
-        margins = self.grid_layout.contentsMargins()
-        available_width = width - margins.left() - margins.right() - 20  # 减去滚动条宽度
+        # 可用宽度 + 间距（已扣除左右边距与滚动条宽度，见 _update_geometry_cache）
+        available = width - self._h_reserved
         
         # 计算可以容纳的列数
-        if available_width <= 0:
+        if available <= self.grid_spacing:
             return self.min_columns
         
-        # 考虑间距的列数计算
-        columns = max(1, (available_width + spacing) // (thumbnail_width + spacing))
+        # 考虑间距的列数计算（单列宽度 = 缩略图宽度 + 边框 + 间距）
+        columns = available // self._tile_w
         
-        # 限制在最小和最大列数之间
-        return max(self.min_columns, min(self.max_columns, columns))
+        # 限制在最小和最大列数之间（min_columns 不小于 1）
+        if columns < self.min_columns:
+            return self.min_columns
+        if columns > self.max_columns:
+            return self.max_columns
+        return columns
     
     def update_columns_for_width(self):
         """根据当前宽度更新列数"""
@@ -220,11 +265,10 @@ class ImageGridWidget(QWidget):
         # 只有在列数真正改变时才更新布局
         if optimal_columns != self.columns:
             self.columns = optimal_columns
+            self._update_geometry_cache()
             # 只重新排列，不重新创建组件
             if self.thumbnail_widgets:
                 self.rearrange_existing_thumbnails()
-                # 添加弹性空间
-                self.grid_layout.setRowStretch(self.grid_layout.rowCount(), 1)
                 # 更新最小宽度
                 self.update_minimum_width()
     
@@ -242,77 +286,71 @@ class ImageGridWidget(QWidget):
                 self.images = images
         else:
             self.images = images
+        # 每张图片的首选URL与图片键只在设置列表时计算一次
+        self._image_urls = [self._preferred_url(img) for img in self.images]
+        # 图片键：有URL时即为URL，否则退回图片ID
+        self._image_keys = [u or str(img.get('id', '')) for u, img in zip(self._image_urls, self.images)]
         self.current_page = page
         self.total_pages = total_pages
+        self._preloaded_urls = set()
         
         self.update_grid()
         self.update_pagination()
         
-        if hasattr(self.image_loader, 'preload_thumbnails') and images:
-            urls = []
-            for img in images:
-                url = (img.get('thumbnail_url') or
-                       img.get('preview_url') or
-                       img.get('file_url'))
-                if url:
-                    urls.append(url)
+        if hasattr(self.image_loader, 'preload_thumbnails') and self.images:
+            urls = [u for u in self._image_urls if u]
             if urls:
                 first_count = max(self.columns, min(len(urls), self.columns * 2))
-                for u in urls[:first_count]:
-                    if hasattr(self.image_loader, 'load_thumbnail'):
+                if hasattr(self.image_loader, 'load_thumbnails_priority'):
+                    self.image_loader.load_thumbnails_priority(urls[:first_count], self.thumbnail_size)
+                elif hasattr(self.image_loader, 'load_thumbnail'):
+                    for u in urls[:first_count]:
                         self.image_loader.load_thumbnail(u, self.thumbnail_size, priority=True)
                 remaining = urls[first_count:]
                 if remaining:
                     self.image_loader.preload_thumbnails(remaining, self.thumbnail_size)
+                self._preloaded_urls.update(urls)
         QTimer.singleShot(100, self._preload_viewport)
     
     def clear_thumbnail_cache(self):
-        """清除缓存的缩略图组件"""
-        for thumbnail in self.thumbnail_widgets:
+        """清除缓存的缩略图组件（包括空闲池）"""
+        for thumbnail in list(self._slot_widgets.values()) + self._free_thumbnails:
+            if self.event_manager:
+                try:
+                    self.event_manager.unregister_thumbnail(thumbnail)
+                except Exception:
+                    pass
             thumbnail.setParent(None)
-        self.thumbnail_widgets.clear()
+        self._slot_widgets = {}
+        self._free_thumbnails = []
+        self._bound_range = None
+        self._url_index = {}
+        self._preloaded_urls = set()
+        self.thumbnail_widgets = []
         self.selected_image = None
         self.selected_thumbnail = None
-        try:
-            self._recreate_timer.stop()
-        except Exception:
-            pass
     
     def update_grid(self):
         """更新网格显示"""
         if not self.thumbnail_widgets:
-            self.recreate_thumbnails_async()
+            self.recreate_thumbnails()
         else:
-            prev_keys = [self._image_key(w.image_data) for w in self.thumbnail_widgets]
-            new_keys = [self._image_key(img) for img in self.images]
-            if prev_keys == new_keys:
+            # 只比较已绑定的槽位：组件仅覆盖可视带，而非整个图片列表
+            unchanged = all(
+                i < len(self._image_keys) and self._image_keys[i] == w._cache_key
+                for i, w in self._slot_widgets.items()
+            )
+            if unchanged:
                 self.rearrange_existing_thumbnails()
             else:
                 self._update_thumbnails_incremental()
         
-        # 添加弹性空间
-        self.grid_layout.setRowStretch(self.grid_layout.rowCount(), 1)
-        
         # 更新最小宽度以确保至少显示1列
         self.update_minimum_width()
 
     def rearrange_existing_thumbnails(self):
-        """重新排列现有的缩略图组件"""
-        # 从布局中移除所有组件，但不删除
-        for i in reversed(range(self.grid_layout.count())):
-            item = self.grid_layout.itemAt(i)
-            if item and item.widget():
-                self.grid_layout.removeItem(item)
-        
-        # 若当前无缩略图，直接返回，避免未定义变量
-        if not self.thumbnail_widgets:
-            return
-
-        # 重新添加到新的位置
-        for i, thumbnail in enumerate(self.thumbnail_widgets):
-            row = i // self.columns
-            col = i % self.columns
-            self.grid_layout.addWidget(thumbnail, row, col)
+        """重新排列现有的缩略图组件（列数或宽度变化后重新定位，可视带随之更新）"""
+        self._update_visible_thumbnails()
     
     def _show_context_menu(self, pos):
         """显示右键菜单：区分卡片与空白区域。
@@ -337,8 +375,8 @@ class ImageGridWidget(QWidget):
             act_refresh = menu.addAction(self.i18n.t("刷新"))
             act_preview = menu.addAction(self.i18n.t("预览图片"))
             try:
-                from ...core.database import DatabaseManager
-                db = DatabaseManager()
+                from ...core.database import get_db
+                db = get_db()
                 img_id = str(img.get('id'))
                 site = (img.get('site') or 'unknown').lower()
                 is_fav = db.is_image_favorited(img_id, site)
@@ -410,184 +448,266 @@ class ImageGridWidget(QWidget):
             pass
     
     def recreate_thumbnails(self):
-        """重新创建缩略图组件"""
-        # 清除现有组件
-        self.clear_thumbnail_cache()
-        
-        # 创建新的缩略图组件
-        for i, image_data in enumerate(self.images):
-            row = i // self.columns
-            col = i % self.columns
-            
+        """重新创建缩略图组件：已绑定组件全部回收到空闲池，再按当前滚动位置重新分配"""
+        for thumbnail in self._slot_widgets.values():
+            self._release_thumbnail(thumbnail)
+        self._slot_widgets = {}
+        self._bound_range = None
+        self._update_visible_thumbnails()
+
+    def _blur_settings(self):
+        """读取 NSFW 模糊策略，返回 (是否模糊, 模糊半径)"""
+        mode = 'off'
+        try:
+            mode = str(self._cfg.get('appearance.nsfw_filter', self._cfg.get('appearance.e_rating_filter', 'off')) or 'off') if self._cfg else 'off'
+        except Exception:
             mode = 'off'
+        try:
+            blur_radius = int(self._cfg.get('appearance.nsfw_blur_radius', self._cfg.get('appearance.e_rating_blur_radius', 12))) if self._cfg else 12
+        except Exception:
+            blur_radius = 12
+        return (mode == 'blur'), blur_radius
+
+    def _connect_thumbnail_signals(self, thumbnail):
+        """未使用事件管理器时直接连接缩略图信号。
+        只在组件创建时连接一次，复用时不再重连；槽函数均为绑定方法，可用 UniqueConnection 防止重复连接。"""
+        unique = Qt.ConnectionType.UniqueConnection
+        thumbnail.clicked.connect(self.image_selected, unique)
+        thumbnail.favorite_toggled.connect(self._on_thumbnail_favorite_toggled, unique)
+        thumbnail.selected.connect(self.on_thumbnail_selected, unique)
+
+    def _update_geometry_cache(self):
+        """缓存单元格尺寸（缩略图卡片 + 间距），仅在缩略图尺寸或列数变化时更新"""
+        self._tile_w = self.thumbnail_size[0] + 20 + self.grid_spacing
+        self._tile_h = max(1, self.thumbnail_size[1] + 20 + self.grid_spacing)
+        # 计算列数时需从宽度中扣除的部分：左右边距 + 滚动条宽度(20) - 末列无需的间距
+        self._h_reserved = self.grid_margin * 2 + 20 - self.grid_spacing
+        # 单列实际步长：多余宽度平均分配到各列，与原网格布局的效果一致
+        grid_widget = getattr(self, 'grid_widget', None)
+        available = (grid_widget.width() if grid_widget else 0) - self.grid_margin * 2 + self.grid_spacing
+        self._col_step = max(self._tile_w, available // max(1, self.columns))
+
+    def _visible_rows(self, extra_rows: int = 0):
+        """根据滚动位置计算可视行范围 [start_row, end_row]，上下各扩展 extra_rows 行"""
+        h = self._viewport_h
+        y = self.scroll_area.verticalScrollBar().value()
+        row_h = self._tile_h
+        start_row = max(0, (y - self.grid_margin) // row_h - extra_rows)
+        end_row = max(0, (y + h - self.grid_margin) // row_h + extra_rows)
+        return start_row, end_row
+
+    def _update_canvas_size(self):
+        """按总行数设置画布高度，让滚动条反映完整列表"""
+        cols = max(1, self.columns)
+        rows = (len(self.images) + cols - 1) // cols
+        height = self.grid_margin * 2 + rows * self._tile_h - self.grid_spacing if rows else 0
+        if self._canvas_height != height:
+            self._canvas_height = height
+            self.grid_widget.setMinimumHeight(height)
+            # 画布变矮时 QScrollArea 不会主动收缩内容，显式调整以刷新滚动范围
+            self.grid_widget.resize(self.grid_widget.width(), max(height, self._viewport_h))
+
+    def _release_thumbnail(self, thumbnail):
+        """隐藏缩略图并放回空闲池，保留父子关系以便低成本复用"""
+        thumbnail.hide()
+        if self.selected_thumbnail is thumbnail:
+            self.selected_thumbnail = None
+        self._unindex_thumbnail(thumbnail)
+        try:
+            thumbnail.set_selected(False)
+        except Exception:
+            pass
+        if self.event_manager:
             try:
-                mode = str(self._cfg.get('appearance.nsfw_filter', self._cfg.get('appearance.e_rating_filter', 'off')) or 'off') if self._cfg else 'off'
-            except Exception:
-                mode = 'off'
-            blur_flag = (mode == 'blur')
-            try:
-                blur_radius = int(self._cfg.get('appearance.nsfw_blur_radius', self._cfg.get('appearance.e_rating_blur_radius', 12))) if self._cfg else 12
+                self.event_manager.unregister_thumbnail(thumbnail)
             except Exception:
-                blur_radius = 12
-            thumbnail = ImageThumbnail(
-                image_data=image_data, 
-                thumbnail_size=self.thumbnail_size, 
-                image_loader=self.image_loader,
-                event_manager=self.event_manager,
-                transform_mode_getter=self.get_transform_mode,
-                blur_if_e=blur_flag,
-                blur_radius=blur_radius
-            )
-            
-            # 连接信号（如果没有使用事件管理器）
-            if not self.event_manager:
-                thumbnail.clicked.connect(self.image_selected.emit)
-                thumbnail.favorite_clicked.connect(lambda d=image_data: self._on_thumbnail_favorite_clicked(d))
-                thumbnail.selected.connect(self.on_thumbnail_selected)
-            
-            self.thumbnail_widgets.append(thumbnail)
-            self.grid_layout.addWidget(thumbnail, row, col)
-
-    def recreate_thumbnails_async(self):
-        self.clear_thumbnail_cache()
-        for i in reversed(range(self.grid_layout.count())):
-            item = self.grid_layout.itemAt(i)
-            if item and item.widget():
-                self.grid_layout.removeItem(item)
-        self._recreate_index = 0
-        self._recreate_timer.start(0)
-
-    def _recreate_step(self):
-        start = self._recreate_index
-        end = min(len(self.images), start + max(1, int(self._recreate_batch_size)))
+                pass
+        self._free_thumbnails.append(thumbnail)
+
+    def _index_thumbnail(self, thumbnail, key: str):
+        thumbnail._cache_key = key
+        self._url_index.setdefault(key, []).append(thumbnail)
+
+    def _unindex_thumbnail(self, thumbnail):
+        key = getattr(thumbnail, '_cache_key', None)
+        bucket = self._url_index.get(key)
+        if bucket and thumbnail in bucket:
+            bucket.remove(thumbnail)
+            if not bucket:
+                del self._url_index[key]
+
+    def _bind_thumbnail(self, thumbnail, image_data: dict, blur, key: str):
+        """把复用的缩略图组件绑定到新的图片数据"""
+        same_image = getattr(thumbnail, '_cache_key', None) == key
+        # 先更新URL索引再加载，缓存命中时同步发出的加载信号才能找到该组件
+        self._unindex_thumbnail(thumbnail)
+        self._index_thumbnail(thumbnail, key)
+        if thumbnail.image_data is not image_data:
+            if same_image:
+                thumbnail.update_image_data(image_data)
+            else:
+                thumbnail.reset(image_data)
+        try:
+            thumbnail.update_blur_policy(blur[0], blur[1])
+        except Exception:
+            pass
+
+    def _acquire_thumbnail(self, index: int, image_data: dict, blur, key: str):
+        """为指定索引取得缩略图组件：优先复用空闲池，池空时才新建"""
+        if self._free_thumbnails:
+            thumbnail = self._free_thumbnails.pop()
+            self._slot_widgets[index] = thumbnail
+            if self.event_manager:
+                self.event_manager.register_thumbnail(thumbnail, image_data)
+            self._bind_thumbnail(thumbnail, image_data, blur, key)
+            return thumbnail
+        thumbnail = self._create_thumbnail(image_data, blur)
+        # 图片键缓存在组件上，比较与复用时不必每次重新计算
+        self._index_thumbnail(thumbnail, key)
+        self._slot_widgets[index] = thumbnail
+        return thumbnail
+
+    def _create_thumbnail(self, image_data: dict, blur):
+        thumbnail = ImageThumbnail(
+            image_data=image_data,
+            thumbnail_size=self.thumbnail_size,
+            image_loader=self.image_loader,
+            event_manager=self.event_manager,
+            transform_mode_getter=self.get_transform_mode,
+            blur_if_e=blur[0],
+            blur_radius=blur[1]
+        )
+        if not self.event_manager:
+            self._connect_thumbnail_signals(thumbnail)
+        thumbnail.setParent(self.grid_widget)
+        return thumbnail
+
+    def _prewarm_target(self) -> int:
+        """一屏可视带所需的组件数量"""
+        rows = self._viewport_h // self._tile_h + 2 + self._preload_rows * 2
+        return max(1, self.columns) * rows
+
+    def _prewarm_pool(self):
+        """空闲时分批创建空白缩略图放入空闲池，每批之后让出事件循环"""
+        try:
+            missing = self._prewarm_target() - len(self._slot_widgets) - len(self._free_thumbnails)
+            if missing <= 0:
+                return
+            blur = self._blur_settings()
+            for _ in range(min(missing, self._prewarm_batch)):
+                thumbnail = self._create_thumbnail({}, blur)
+                if self.event_manager:
+                    self.event_manager.unregister_thumbnail(thumbnail)
+                self._free_thumbnails.append(thumbnail)
+            if missing > self._prewarm_batch:
+                self._prewarm_timer.start(0)
+        except Exception:
+            pass
+
+    def _update_visible_thumbnails(self, rebind: bool = False):
+        """同步可视带内的缩略图组件。
+        rebind=True 表示图片列表已变化：按图片键复用已有组件，其余回收到空闲池。"""
+        self._update_canvas_size()
+        cols = max(1, self.columns)
+        start_row, end_row = self._visible_rows(self._preload_rows)
+        start = min(len(self.images), start_row * cols)
+        end = min(len(self.images), (end_row + 1) * cols)
+        col_step = self._col_step
+        row_step = self._tile_h
+
+        # 可视带与几何都没变时（同一行内的滚动）无需触碰任何组件
+        signature = (cols, col_step, row_step)
+        if not rebind and (start, end) == self._bound_range and signature == self._layout_signature:
+            return
+        self._bound_range = (start, end)
+        self._layout_signature = signature
+
+        # 批量回收、绑定和移动期间关闭重绘，结束时统一刷新一次
+        self.grid_widget.setUpdatesEnabled(False)
+        try:
+            self._sync_slots(start, end, cols, col_step, row_step, rebind)
+        finally:
+            self.grid_widget.setUpdatesEnabled(True)
+
+    def _sync_slots(self, start: int, end: int, cols: int, col_step: int, row_step: int, rebind: bool):
+        """回收可视带外的组件，为 [start, end) 内的槽位绑定组件并定位"""
+        reusable = {}
+        if rebind:
+            for thumbnail in self._slot_widgets.values():
+                if thumbnail._cache_key in reusable:
+                    self._release_thumbnail(thumbnail)
+                else:
+                    reusable[thumbnail._cache_key] = thumbnail
+            self._slot_widgets = {}
+        else:
+            for i in [i for i in self._slot_widgets if i < start or i >= end]:
+                self._release_thumbnail(self._slot_widgets.pop(i))
+
+        blur = None
         for i in range(start, end):
-            image_data = self.images[i]
-            row = i // self.columns
-            col = i % self.columns
-            mode = 'off'
-            try:
-                mode = str(self._cfg.get('appearance.nsfw_filter', self._cfg.get('appearance.e_rating_filter', 'off')) or 'off') if self._cfg else 'off'
-            except Exception:
-                mode = 'off'
-            blur_flag = (mode == 'blur')
-            try:
-                blur_radius = int(self._cfg.get('appearance.nsfw_blur_radius', self._cfg.get('appearance.e_rating_blur_radius', 12))) if self._cfg else 12
-            except Exception:
-                blur_radius = 12
-            thumbnail = ImageThumbnail(
-                image_data=image_data,
-                thumbnail_size=self.thumbnail_size,
-                image_loader=self.image_loader,
-                event_manager=self.event_manager,
-                transform_mode_getter=self.get_transform_mode,
-                blur_if_e=blur_flag,
-                blur_radius=blur_radius
-            )
-            if not self.event_manager:
-                thumbnail.clicked.connect(self.image_selected.emit)
-                thumbnail.favorite_clicked.connect(lambda d=image_data: self._on_thumbnail_favorite_clicked(d))
-                thumbnail.selected.connect(self.on_thumbnail_selected)
-            self.thumbnail_widgets.append(thumbnail)
-            self.grid_layout.addWidget(thumbnail, row, col)
-        self._recreate_index = end
-        if self._recreate_index >= len(self.images):
-            self._recreate_timer.stop()
-            self.grid_layout.setRowStretch(self.grid_layout.rowCount(), 1)
-            self.update_minimum_width()
-
-    def _image_key(self, image_data: dict) -> str:
-        url = image_data.get('thumbnail_url') or image_data.get('preview_url') or image_data.get('file_url')
-        if url:
-            return url
-        return str(image_data.get('id', ''))
+            thumbnail = self._slot_widgets.get(i)
+            if thumbnail is None:
+                image_data = self.images[i]
+                if blur is None:
+                    blur = self._blur_settings()
+                key = self._image_keys[i]
+                thumbnail = reusable.pop(key, None)
+                if thumbnail is not None:
+                    self._slot_widgets[i] = thumbnail
+                    self._bind_thumbnail(thumbnail, image_data, blur, key)
+                else:
+                    thumbnail = self._acquire_thumbnail(i, image_data, blur, key)
+                is_selected = self.selected_image is not None and image_data is self.selected_image
+                thumbnail.set_selected(is_selected)
+                if is_selected:
+                    self.selected_thumbnail = thumbnail
+            row, col = divmod(i, cols)
+            thumbnail.move(self.grid_margin + col * col_step, self.grid_margin + row * row_step)
+            if thumbnail.isHidden():
+                thumbnail.show()
+
+        for thumbnail in reusable.values():
+            self._release_thumbnail(thumbnail)
+        self.thumbnail_widgets = [self._slot_widgets[i] for i in sorted(self._slot_widgets)]
+
+    @staticmethod
+    def _preferred_url(image_data: dict):
+        """缩略图首选URL：缩略图 -> 预览图 -> 原图"""
+        return image_data.get('thumbnail_url') or image_data.get('preview_url') or image_data.get('file_url')
 
     def _update_thumbnails_incremental(self):
-        existing = {}
-        for w in self.thumbnail_widgets:
-            k = self._image_key(w.image_data)
-            existing[k] = w
-
-        new_widgets = []
-        used_keys = set()
-        for img in self.images:
-            k = self._image_key(img)
-            w = existing.get(k)
-            if w:
-                if w.image_data is not img:
-                    w.update_image_data(img)
-                try:
-                    radius = int(self._cfg.get('appearance.nsfw_blur_radius', self._cfg.get('appearance.e_rating_blur_radius', 25))) if self._cfg else 25
-                except Exception:
-                    radius = 25
-                try:
-                    mode = 'off'
-                    try:
-                        mode = str(self._cfg.get('appearance.nsfw_filter', self._cfg.get('appearance.e_rating_filter', 'off')) or 'off') if self._cfg else 'off'
-                    except Exception:
-                        mode = 'off'
-                    w.update_blur_policy(bool(mode == 'blur'), radius)
-                except Exception:
-                    pass
-                new_widgets.append(w)
-                used_keys.add(k)
-            else:
-                row = len(new_widgets) // self.columns
-                col = len(new_widgets) % self.columns
-                mode = 'off'
-                try:
-                    mode = str(self._cfg.get('appearance.nsfw_filter', self._cfg.get('appearance.e_rating_filter', 'off')) or 'off') if self._cfg else 'off'
-                except Exception:
-                    mode = 'off'
-                blur_flag = (mode == 'blur')
-                try:
-                    blur_radius = int(self._cfg.get('appearance.nsfw_blur_radius', self._cfg.get('appearance.e_rating_blur_radius', 12))) if self._cfg else 12
-                except Exception:
-                    blur_radius = 12
-                w = ImageThumbnail(
-                    image_data=img,
-                    thumbnail_size=self.thumbnail_size,
-                    image_loader=self.image_loader,
-                    event_manager=self.event_manager,
-                    transform_mode_getter=self.get_transform_mode,
-                    blur_if_e=blur_flag,
-                    blur_radius=blur_radius
-                )
-                if not self.event_manager:
-                    w.clicked.connect(self.image_selected.emit)
-                    w.favorite_clicked.connect(self.favorite_added.emit)
-                    w.selected.connect(self.on_thumbnail_selected)
-                new_widgets.append(w)
-
-        for w in self.thumbnail_widgets:
-            k = self._image_key(w.image_data)
-            if k not in used_keys:
-                w.setParent(None)
-
-        for i in reversed(range(self.grid_layout.count())):
-            item = self.grid_layout.itemAt(i)
-            if item and item.widget():
-                self.grid_layout.removeItem(item)
-
-        self.thumbnail_widgets = new_widgets
-        for i, w in enumerate(self.thumbnail_widgets):
-            row = i // self.columns
-            col = i % self.columns
-            self.grid_layout.addWidget(w, row, col)
+        """图片列表变化后按图片键复用已有组件，未命中的从空闲池重新绑定"""
+        self._update_visible_thumbnails(rebind=True)
 
     def _on_scroll_changed(self, *args):
+        try:
+            # 位移不足半行时可视带上下各有一行预载余量，只需顺延静止计时
+            y = self.scroll_area.verticalScrollBar().value()
+            if self._last_scroll_y >= 0 and abs(y - self._last_scroll_y) < self._tile_h // 2:
+                self.scroll_settle_timer.start(120)
+                return
+            self._last_scroll_y = y
+            self._update_visible_thumbnails()
+        except Exception:
+            pass
         try:
             self.is_scrolling = True
             self.scroll_settle_timer.start(120)
-            if hasattr(self.image_loader, 'set_paused'):
+            # 每次滚动过程只暂停一次加载器
+            if not self._scroll_paused and hasattr(self.image_loader, 'set_paused'):
                 self.image_loader.set_paused(True)
+                self._scroll_paused = True
         except Exception:
             pass
 
     def _on_scroll_settled(self):
         try:
             self.is_scrolling = False
-            if hasattr(self.image_loader, 'set_paused'):
+            self._last_scroll_y = self.scroll_area.verticalScrollBar().value()
+            self._update_visible_thumbnails()
+            if self._scroll_paused and hasattr(self.image_loader, 'set_paused'):
                 self.image_loader.set_paused(False)
+            self._scroll_paused = False
             self._preload_viewport()
         except Exception:
             pass
@@ -598,24 +718,14 @@ class ImageGridWidget(QWidget):
 
     def _preload_viewport(self):
         try:
-            vp = self.scroll_area.viewport()
-            if not vp:
-                return
-            h = vp.height()
-            tile_h = self.thumbnail_size[1] + 80
-            y = self.scroll_area.verticalScrollBar().value()
-            start_row = max(0, y // tile_h)
-            vis_rows = max(1, (h // tile_h) + 2)
-            end_row = start_row + vis_rows
-            urls = []
-            for i, img in enumerate(self.images):
-                row = i // max(1, self.columns)
-                if start_row - 1 <= row <= end_row + 1:
-                    u = img.get('thumbnail_url') or img.get('preview_url') or img.get('file_url')
-                    if u:
-                        urls.append(u)
-            if urls and hasattr(self.image_loader, 'preload_thumbnails'):
-                self.image_loader.preload_thumbnails(urls, self.thumbnail_size)
+            cols = max(1, self.columns)
+            start_row, end_row = self._visible_rows(self._preload_rows + 1)
+            band = self._image_urls[start_row * cols:(end_row + 1) * cols]
+            # 只提交本页尚未入队的URL
+            new_urls = [u for u in band if u and u not in self._preloaded_urls]
+            if new_urls and hasattr(self.image_loader, 'preload_thumbnails'):
+                self._preloaded_urls.update(new_urls)
+                self.image_loader.preload_thumbnails(new_urls, self.thumbnail_size)
         except Exception:
             pass
     
@@ -633,16 +743,6 @@ class ImageGridWidget(QWidget):
             # 双击时发送选择信号并可能触发预览
             self.image_selected.emit(thumbnail.image_data)
     
-    def _on_event_thumbnail_hovered(self, event_data):
-        """处理缩略图悬停事件"""
-        # 可以在这里添加悬停效果，比如显示工具提示
-        pass
-    
-    def _on_event_thumbnail_unhovered(self, event_data):
-        """处理缩略图取消悬停事件"""
-        # 清理悬停效果
-        pass
-    
     def _on_event_thumbnail_selected(self, event_data):
         """处理缩略图选择事件"""
         thumbnail = event_data.thumbnail_widget
@@ -654,8 +754,8 @@ class ImageGridWidget(QWidget):
         thumbnail = event_data.thumbnail_widget
         if hasattr(thumbnail, 'image_data'):
             try:
-                from ...core.database import DatabaseManager
-                db = DatabaseManager()
+                from ...core.database import get_db
+                db = get_db()
                 img = thumbnail.image_data
                 img_id = str(img.get('id'))
                 site = (img.get('site') or 'unknown').lower()
@@ -667,10 +767,13 @@ class ImageGridWidget(QWidget):
             except Exception:
                 self.favorite_added.emit(thumbnail.image_data)
 
+    def _on_thumbnail_favorite_toggled(self, image_data: dict, _favorited: bool):
+        self._on_thumbnail_favorite_clicked(image_data)
+
     def _on_thumbnail_favorite_clicked(self, image_data: dict):
         try:
-            from ...core.database import DatabaseManager
-            db = DatabaseManager()
+            from ...core.database import get_db
+            db = get_db()
             img_id = str(image_data.get('id'))
             site = (image_data.get('site') or 'unknown').lower()
             if db.is_image_favorited(img_id, site):
@@ -683,8 +786,7 @@ class ImageGridWidget(QWidget):
     def update_minimum_width(self):
         """更新最小宽度以确保至少显示1列"""
         thumbnail_width = self.thumbnail_size[0] + 20  # 缩略图宽度 + 边框
-        margins = self.grid_layout.contentsMargins()
-        min_width = thumbnail_width + margins.left() + margins.right() + 40  # 额外空间
+        min_width = thumbnail_width + self.grid_margin * 2 + 40  # 额外空间
         
         # 设置主窗口的最小宽度
         main_window = self.window()
@@ -694,30 +796,33 @@ class ImageGridWidget(QWidget):
                 main_window.setMinimumWidth(min_width)
 
     def on_image_loaded(self, url: str, pixmap: QPixmap):
-        """图片加载完成处理"""
-        # 查找对应的缩略图组件并更新
-        for thumbnail in self.thumbnail_widgets:
-            if isinstance(thumbnail, ImageThumbnail):
-                # 使用新的ImageThumbnail组件的属性
-                thumb_url = thumbnail.image_data.get('thumbnail_url')
-                preview_url = thumbnail.image_data.get('preview_url')
-                file_url = thumbnail.image_data.get('file_url')
-                if url in (thumb_url, preview_url, file_url):
-                    thumbnail.on_image_loaded(url, pixmap)
-                    break
+        """图片加载完成处理：先缓冲，同一帧内完成的图片合并为一次重绘"""
+        self._pending_loads[url] = pixmap
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(16)
+
+    def _flush_loaded(self):
+        """把缓冲的加载结果一次性交给对应缩略图"""
+        pending, self._pending_loads = self._pending_loads, {}
+        if not pending:
+            return
+        self.grid_widget.setUpdatesEnabled(False)
+        try:
+            for url, pixmap in pending.items():
+                # 按URL索引直接找到绑定该图片的缩略图组件
+                for thumbnail in list(self._url_index.get(url, ())):
+                    try:
+                        thumbnail.on_image_loaded(url, pixmap)
+                    except Exception:
+                        pass
+        finally:
+            self.grid_widget.setUpdatesEnabled(True)
     
     def on_image_failed(self, url: str, error: str):
         """图片加载失败处理"""
-        # 查找对应的缩略图组件并显示错误
-        for thumbnail in self.thumbnail_widgets:
-            if isinstance(thumbnail, ImageThumbnail):
-                # 使用新的ImageThumbnail组件的属性
-                thumb_url = thumbnail.image_data.get('thumbnail_url')
-                preview_url = thumbnail.image_data.get('preview_url')
-                file_url = thumbnail.image_data.get('file_url')
-                if url in (thumb_url, preview_url, file_url):
-                    thumbnail.on_image_failed(url, error)
-                    break
+        # 按URL索引直接找到绑定该图片的缩略图组件
+        for thumbnail in list(self._url_index.get(url, ())):
+            thumbnail.on_image_failed(url, error)
     
     def update_pagination(self):
         """更新分页控制"""
@@ -743,13 +848,25 @@ class ImageGridWidget(QWidget):
     
     def set_columns(self, columns: int):
         """设置列数"""
+        if columns == self.columns:
+            return
         self.columns = columns
-        self.update_grid()
+        self._update_geometry_cache()
+        # 图片列表未变，只需重新定位
+        self.rearrange_existing_thumbnails()
     
     def set_thumbnail_size(self, size: tuple):
         """设置缩略图大小"""
+        size = tuple(size)
+        if size == tuple(self.thumbnail_size):
+            return
         self.thumbnail_size = size
-        self.update_grid()
+        self._update_geometry_cache()
+        # 已有组件（含空闲池）原地调整尺寸，无需重建
+        for thumbnail in list(self._slot_widgets.values()) + self._free_thumbnails:
+            thumbnail.set_thumbnail_size(size)
+        self.rearrange_existing_thumbnails()
+        self.update_minimum_width()
     
     def on_thumbnail_selected(self, thumbnail):
         """处理缩略图选择"""
@@ -781,10 +898,14 @@ class ImageGridWidget(QWidget):
     
     def select_first_image(self):
         """选择第一张图片"""
-        if self.thumbnail_widgets:
-            first_thumbnail = self.thumbnail_widgets[0]
-            if isinstance(first_thumbnail, ImageThumbnail):
-                self.on_thumbnail_selected(first_thumbnail)
+        # 槽位中只会放入 ImageThumbnail，无需类型检查
+        first_thumbnail = self._slot_widgets.get(0)
+        if first_thumbnail is not None:
+            self.on_thumbnail_selected(first_thumbnail)
+        elif self.images:
+            # 第一行已滚出可视区：只记录选择，回到顶部绑定组件时再高亮
+            self.clear_selection()
+            self.selected_image = self.images[0]
     
     @property
     def current_images(self):
@@ -3,108 +3,385 @@
 图片加载器
 """
 
+import atexit
+import functools
+import io
+import os
 import requests
 import time
-from PyQt6.QtCore import QThread, pyqtSignal, QObject, Qt, QTimer
-from PyQt6.QtGui import QPixmap
-from typing import Optional, Tuple
+import weakref
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt6.QtCore import QRunnable, QThreadPool, QTimer, pyqtSignal, QObject, Qt, QByteArray, QBuffer, QIODevice, QSize
+from PyQt6.QtGui import QPixmap, QPixmapCache, QImage, QImageReader, QImageWriter
+from typing import Dict, List, Optional, Tuple
+from PIL import Image
 from ...core.cache_manager import CacheManager
 
-class ImageLoadWorker(QThread):
-    """图片加载工作线程"""
+# 计时函数缓存为模块级名称，热路径上省去属性查找
+_perf = time.perf_counter
+_monotonic = time.monotonic
+
+# 流式下载的单次读取块大小
+_CHUNK_SIZE = 64 * 1024
+
+# 加载失败的URL在该时间内直接复用同一失败结果，不再重复提交任务（秒）
+_FAILURE_TTL = 30.0
+_FAILURE_CACHE_MAX = 1024
+
+# 缩略图变体写盘的编码质量
+_VARIANT_QUALITY = 80
+
+# 不超过该边长的缩略图按低质量快速解码（JPEG 快速 IDCT），且不应用 EXIF 旋转
+_FAST_DECODE_MAX_SIDE = 256
+_FAST_DECODE_QUALITY = 25
+
+# 缩略图缩放滤镜（Pillow 9.1 起移入 Image.Resampling）
+_THUMBNAIL_FILTER = getattr(Image, 'Resampling', Image).BILINEAR
+
+# 并发上限的最大值（性能面板滑块上限为 16）；连接池按此一次性配置
+_MAX_CONCURRENT = 16
+
+
+def _create_session() -> requests.Session:
+    """创建共享会话：挂载带重试的连接池适配器，复用同一主机的 TCP/TLS 连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_MAX_CONCURRENT,
+        pool_maxsize=_MAX_CONCURRENT * 2,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': 'FalconPy/1.0',
+        'Accept-Encoding': 'gzip'
+    })
+    return session
+
+
+# 加载结果保存在 Qt 原生的 QPixmapCache 中（C++ LRU，单位 KB）；只能在 GUI 线程访问
+QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), 256 * 1024))
+
+
+def _pixmap_key(url: str, size: Optional[Tuple[int, int]] = None) -> str:
+    """QPixmapCache 键：按URL与请求尺寸区分"""
+    if size:
+        return f"{url}@{size[0]}x{size[1]}"
+    return url
+
+
+class _FrequencySketch:
+    """
+    TinyLFU 访问频率估计：4 行 x 1024 列的 Count-Min Sketch（计数饱和于 15，即 4 位计数）
+    加一个门卫位图（只出现过一次的键只记在门卫中，不占用计数）
+    累计记录次数达到采样上限后所有计数减半、清空门卫（老化），使频率反映近期访问
+    """
+    
+    _ROWS = 4
+    _WIDTH = 1024
+    _MAX_COUNT = 15
+    _DOORKEEPER_BITS = 8192
+    
+    def __init__(self, sample_size: int = 10 * 1024):
+        self._table = bytearray(self._ROWS * self._WIDTH)
+        self._doorkeeper = bytearray(self._DOORKEEPER_BITS // 8)
+        self._sample_size = sample_size
+        self._additions = 0
+    
+    def _indexes(self, h: int):
+        # 64 位哈希的不同 10 位片段作为各行的列下标
+        return [row * self._WIDTH + ((h >> (row * 10)) & (self._WIDTH - 1)) for row in range(self._ROWS)]
+    
+    def record(self, key: str):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        bit = (h >> 40) & (self._DOORKEEPER_BITS - 1)
+        byte, mask = bit >> 3, 1 << (bit & 7)
+        if not self._doorkeeper[byte] & mask:
+            self._doorkeeper[byte] |= mask
+        else:
+            table = self._table
+            for i in self._indexes(h):
+                if table[i] < self._MAX_COUNT:
+                    table[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+    
+    def frequency(self, key: str) -> int:
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        bit = (h >> 40) & (self._DOORKEEPER_BITS - 1)
+        seen = 1 if self._doorkeeper[bit >> 3] & (1 << (bit & 7)) else 0
+        table = self._table
+        return min(table[i] for i in self._indexes(h)) + seen
+    
+    def _age(self):
+        self._table = bytearray(c >> 1 for c in self._table)
+        self._doorkeeper = bytearray(len(self._doorkeeper))
+        self._additions //= 2
+
+
+# 已注册的缓存管理器（id -> 实例），供按 id 记忆化的缓存键函数查找；实例被回收后自动移除
+_cache_managers = weakref.WeakValueDictionary()
+
+
+@functools.lru_cache(maxsize=4096)
+def _base_key(cm_id: int, url: str) -> str:
+    """URL 的磁盘缓存键（记忆化，避免重复计算摘要）"""
+    return _cache_managers[cm_id].get_cache_key(url)
+
+
+def _variant_key(base_key: str, width: int, height: int) -> str:
+    """缩略图尺寸变体的磁盘缓存键：由原图键直接派生，不再计算摘要（键同时用作文件名）"""
+    return f"{base_key}_{width}x{height}"
+
+
+@functools.lru_cache(maxsize=1)
+def _variant_format() -> str:
+    """缩略图变体的编码格式：有 WebP 插件时用 WebP（体积约为 PNG 的 1/3~1/5），否则用 PNG"""
+    try:
+        if b'webp' in [bytes(f).lower() for f in QImageWriter.supportedImageFormats()]:
+            return 'WEBP'
+    except Exception:
+        pass
+    return 'PNG'
+
+
+# 进程级共享会话：所有加载线程共用连接池，避免每张图片都重新握手
+_SHARED_SESSION = _create_session()
+
+
+@atexit.register
+def _close_shared_session():
+    try:
+        _SHARED_SESSION.close()
+    except Exception:
+        pass
+
+
+def _scale_for_thumb(image, width: int, height: int):
+    """等比缩放 QImage/QPixmap：缩小到原尺寸一半以下时平滑缩放，小幅缩放用快速缩放"""
+    if width < image.width() // 2 or height < image.height() // 2:
+        mode = Qt.TransformationMode.SmoothTransformation
+    else:
+        mode = Qt.TransformationMode.FastTransformation
+    return image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio, mode)
+
+
+def _read_image(data: QByteArray, size: Optional[Tuple[int, int]] = None) -> QImage:
+    """用 QImageReader 解码；指定尺寸时按比例在解码阶段直接缩放（JPEG 可跳过全分辨率解码）"""
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    try:
+        reader = QImageReader(buffer)
+        scaled = False
+        if size and max(size) <= _FAST_DECODE_MAX_SIDE:
+            reader.setQuality(_FAST_DECODE_QUALITY)
+            reader.setAutoTransform(False)
+        if size:
+            source_size = reader.size()
+            if source_size.isValid():
+                reader.setScaledSize(source_size.scaled(QSize(size[0], size[1]), Qt.AspectRatioMode.KeepAspectRatio))
+                scaled = True
+        image = reader.read()
+    finally:
+        buffer.close()
+    # 无法预先读取原始尺寸的格式，解码后再缩放
+    if size and not scaled and not image.isNull():
+        image = _scale_for_thumb(image, size[0], size[1])
+    return image
+
+
+def _pil_thumbnail(data: bytes, size: Tuple[int, int]):
+    """
+    用 Pillow 解码并等比缩小为缩略图（可在工作线程调用）
+    JPEG 走 draft 模式，解码时即按 1/2~1/8 缩小，不产生全分辨率像素
+
+    Returns:
+        (QImage, bytes) 或 None（Pillow 无法处理时）：QImage 直接引用 bytes 不拷贝，转换为 QPixmap 前须一并持有
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            im.draft('RGB', size)
+            im.thumbnail(size, _THUMBNAIL_FILTER)
+            if im.mode not in ('RGB', 'RGBA'):
+                has_alpha = 'A' in im.mode or 'transparency' in im.info
+                im = im.convert('RGBA' if has_alpha else 'RGB')
+            width, height = im.size
+            if im.mode == 'RGB':
+                raw = im.tobytes('raw', 'RGB')
+                return QImage(raw, width, height, width * 3, QImage.Format.Format_RGB888), raw
+            # 按 BGRA 字节序导出，对应 QImage 的 ARGB32
+            raw = im.tobytes('raw', 'BGRA')
+            return QImage(raw, width, height, width * 4, QImage.Format.Format_ARGB32), raw
+    except Exception:
+        return None
+
+
+def _prefetch_file(path) -> bool:
+    """把文件读入系统页缓存（POSIX 下只提示内核预读），返回文件是否存在"""
+    try:
+        fd = os.open(str(path), os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except OSError:
+        return False
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            while os.read(fd, 1024 * 1024):
+                pass
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+    return True
+
+
+class _DiskPrefetchTask(QRunnable):
+    """预读排队中任务的磁盘缓存文件（不解码），任务真正执行时读取即可命中页缓存"""
+    
+    def __init__(self, cache_manager: CacheManager, url: str, size: Optional[Tuple[int, int]]):
+        super().__init__()
+        self.cache_manager = cache_manager
+        self.url = url
+        self.size = size
     
-    image_loaded = pyqtSignal(str, QPixmap)  # url, pixmap
+    def run(self):
+        try:
+            base_key = _base_key(id(self.cache_manager), self.url)
+            # 有缩放好的变体时，加载任务不会再读原图
+            if self.size and _prefetch_file(self.cache_manager.get_cache_path(
+                    _variant_key(base_key, self.size[0], self.size[1]))):
+                return
+            _prefetch_file(self.cache_manager.get_cache_path(base_key))
+        except Exception:
+            pass
+
+
+class ImageLoadSignals(QObject):
+    image_decoded = pyqtSignal(str, object)  # url, (QImage, bytes 或 None)；QPixmap 须在 GUI 线程创建
     load_failed = pyqtSignal(str, str)  # url, error_message
+    finished = pyqtSignal(object)  # 任务自身
+
+
+class ImageLoadWorker(QRunnable):
+    """图片加载任务，提交到 ImageLoader 的线程池执行"""
     
-    def __init__(self, url: str, cache_manager: CacheManager, size: Optional[Tuple[int, int]] = None, parent=None):
-        super().__init__(parent)
+    def __init__(self, url: str, cache_manager: CacheManager, size: Optional[Tuple[int, int]] = None):
+        super().__init__()
         self.url = url
         self.cache_manager = cache_manager
         self.size = size
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'FalconPy/1.0'
-        })
+        # 协作式取消标记：由 GUI 线程置位，在开始执行、逐块下载、解码前与发出结果前检查
+        self.canceled = False
+        self.started_at = None
+        self.result = None  # 加载得到的 QPixmap（GUI 线程写入）
+        # QRunnable 不是 QObject，信号由内嵌的 QObject 发出
+        self.signals = ImageLoadSignals()
     
     def run(self):
         """运行加载任务"""
+        self.started_at = _perf()
+        try:
+            if not self.canceled:
+                self._load()
+        finally:
+            try:
+                self.signals.finished.emit(self)
+            except Exception:
+                pass
+    
+    def _load(self):
         try:
-            base_key = self.cache_manager.get_cache_key(self.url)
-            # 缩略图尺寸变体的内存键（仅用于内存缓存，不重复写盘）
+            # 内存缓存已由 ImageLoader 在提交任务前于 GUI 线程检查过，这里从磁盘开始
+            base_key = _base_key(id(self.cache_manager), self.url)
             variant_key = None
             if self.size:
-                variant_key = self.cache_manager.get_cache_key(f"{self.url}|{self.size[0]}x{self.size[1]}")
+                variant_key = _variant_key(base_key, self.size[0], self.size[1])
+                # 已缩放好的变体直接读取，免去解码原图与缩放
+                variant_data = self.cache_manager.get_from_disk(variant_key)
+                if variant_data:
+                    image = _read_image(QByteArray(variant_data))
+                    if not image.isNull():
+                        self._emit_decoded((image, None))
+                        return
             
-            # 先检查内存缓存
-            # 若提供尺寸，优先命中变体缓存；否则命中原始缓存
-            pixmap = None
-            if variant_key:
-                pixmap = self.cache_manager.get_from_memory(variant_key)
-            if pixmap is None:
-                pixmap = self.cache_manager.get_from_memory(base_key)
-            if pixmap:
-                # 命中原始缓存但需要尺寸缩略图，做一次缩放并写入变体缓存
-                if self.size and variant_key and (pixmap.width() != self.size[0] or pixmap.height() != self.size[1]):
-                    scaled = pixmap.scaled(
-                        self.size[0], self.size[1],
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.cache_manager.put_to_memory(variant_key, scaled)
-                    self.image_loaded.emit(self.url, scaled)
-                    return
-                self.image_loaded.emit(self.url, pixmap)
-                return
-            
-            # 检查磁盘缓存
+            # 检查磁盘缓存（有尺寸需求时在解码阶段直接缩放）
             cached_data = self.cache_manager.get_from_disk(base_key)
-            if cached_data:
-                pixmap = QPixmap()
-                if pixmap.loadFromData(cached_data):
-                    # 若有尺寸需求，缩放并仅将缩放后的版本写入内存（避免双倍占用）
-                    if self.size and variant_key:
-                        scaled = pixmap.scaled(
-                            self.size[0], self.size[1],
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                            Qt.TransformationMode.SmoothTransformation
-                        )
-                        self.cache_manager.put_to_memory(variant_key, scaled)
-                        self.image_loaded.emit(self.url, scaled)
-                    else:
-                        # 无尺寸需求，缓存原始pixmap到内存
-                        self.cache_manager.put_to_memory(base_key, pixmap)
-                        self.image_loaded.emit(self.url, pixmap)
+            if cached_data and not self.canceled:
+                decoded = self._decode(cached_data)
+                if decoded is not None:
+                    self._emit_decoded(decoded)
+                    self._store_variant(variant_key, decoded[0])
                     return
             
-            # 从网络下载
-            response = self.session.get(self.url, timeout=30)
-            response.raise_for_status()
-            
-            image_data = response.content
+            # 从网络流式下载，分块写入 QByteArray，不再额外持有一份 bytes
+            response = _SHARED_SESSION.get(self.url, timeout=(5, 30), stream=True)
+            try:
+                response.raise_for_status()
+                data = QByteArray()
+                try:
+                    data.reserve(int(response.headers.get('Content-Length', '0') or 0))
+                except ValueError:
+                    pass
+                for chunk in response.iter_content(_CHUNK_SIZE):
+                    if self.canceled:
+                        return
+                    data.append(chunk)
+            finally:
+                response.close()
+            if self.canceled:
+                return
             
-            # 创建pixmap
-            pixmap = QPixmap()
-            if pixmap.loadFromData(image_data):
-                # 存储到缓存
-                self.cache_manager.put_to_disk(base_key, image_data)
-                if self.size and variant_key:
-                    scaled = pixmap.scaled(
-                        self.size[0], self.size[1],
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.cache_manager.put_to_memory(variant_key, scaled)
-                    self.image_loaded.emit(self.url, scaled)
-                else:
-                    self.cache_manager.put_to_memory(base_key, pixmap)
-                    self.image_loaded.emit(self.url, pixmap)
+            # 解码（有尺寸需求时在解码阶段直接缩放）
+            payload = data.data()
+            decoded = self._decode(payload, data)
+            if decoded is not None:
+                self.cache_manager.put_to_disk(base_key, payload)
+                del data, payload
+                self._emit_decoded(decoded)
+                self._store_variant(variant_key, decoded[0])
             else:
-                self.load_failed.emit(self.url, "无法解析图片数据")
+                self._emit_failed("无法解析图片数据")
                 
         except requests.RequestException as e:
-            self.load_failed.emit(self.url, f"网络错误: {str(e)}")
+            self._emit_failed(f"网络错误: {str(e)}")
         except Exception as e:
-            self.load_failed.emit(self.url, f"加载失败: {str(e)}")
+            self._emit_failed(f"加载失败: {str(e)}")
+    
+    def _emit_decoded(self, decoded):
+        if not self.canceled:
+            self.signals.image_decoded.emit(self.url, decoded)
+    
+    def _emit_failed(self, error: str):
+        # 已取消的任务不报告失败，避免被记为失败URL
+        if not self.canceled:
+            self.signals.load_failed.emit(self.url, error)
+    
+    def _store_variant(self, variant_key: Optional[str], image: QImage):
+        """将缩放后的缩略图编码写入磁盘缓存，下次启动无需再解码原图"""
+        if not variant_key:
+            return
+        try:
+            buffer = QBuffer()
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            if image.save(buffer, _variant_format(), _VARIANT_QUALITY):
+                self.cache_manager.put_to_disk(variant_key, buffer.data().data())
+            buffer.close()
+        except Exception:
+            pass
+    
+    def _decode(self, payload: bytes, buffer: Optional[QByteArray] = None):
+        """解码为 (QImage, bytes 或 None)；缩略图优先用 Pillow，其余或 Pillow 不支持的格式用 QImageReader"""
+        if self.size:
+            decoded = _pil_thumbnail(payload, self.size)
+            if decoded is not None:
+                return decoded
+        image = _read_image(buffer if buffer is not None else QByteArray(payload), self.size)
+        if image.isNull():
+            return None
+        return image, None
 
 class ImageLoader(QObject):
     """图片加载器管理器"""
@@ -115,153 +392,243 @@ class ImageLoader(QObject):
     def __init__(self, cache_manager: CacheManager, max_concurrent: int = 5):
         super().__init__()
         self.cache_manager = cache_manager
+        _cache_managers[id(cache_manager)] = cache_manager
         self.max_concurrent = max_concurrent
-        self.active_workers = {}
-        self.pending_requests = []  # [(url, size)]
-        self._dispatch_timer = QTimer()
-        self._dispatch_timer.setSingleShot(True)
-        self._dispatch_timer.timeout.connect(self._dispatch_pending)
-        self._min_launch_interval_ms = 30
-        self._last_launch_ms = 0
-        self._start_ts = {}
-        self._sum_load_ms = 0.0
+        # 线程池自带等待队列，并发上限即最大线程数
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_concurrent)
+        self.pool.setExpiryTimeout(30000)
+        # 磁盘预读线程池：加载任务排队时提前把其缓存文件读入页缓存，与正在进行的解码重叠
+        self._prefetch_pool = QThreadPool()
+        self._prefetch_pool.setMaxThreadCount(2)
+        self.active_workers = {}  # url -> 已提交（排队中或执行中）的任务
+        # 同一URL正在加载时，其他尺寸的请求挂在这里，任务完成后由同一份结果派生
+        self._waiters: Dict[str, List[Optional[Tuple[int, int]]]] = {}
+        # 最近失败的URL -> (失败时间, 错误信息)
+        self._failures: Dict[str, Tuple[float, str]] = {}
+        # 内存缓存准入（TinyLFU）：本加载器写入 QPixmapCache 的条目按近似 LRU 顺序记录，
+        # 总量超出预算时，新条目的访问频率须高于最久未用条目才会写入并淘汰后者，
+        # 避免一次性滚动浏览长列表把常看的缩略图挤出缓存
+        self._sketch = _FrequencySketch()
+        self._resident: "OrderedDict[str, int]" = OrderedDict()  # 键 -> 估算字节数
+        self._resident_bytes = 0
+        self._memory_budget = QPixmapCache.cacheLimit() * 1024 // 2
+        # 平均加载耗时按增量方式更新（Welford），不累积无上限的总和
+        self._mean_ms = 0.0
         self._count_loaded = 0
         self._cancel_count = 0
     
+    def load_batch(self, urls, thumbnail_size: Optional[Tuple[int, int]] = None, priority: bool = False) -> int:
+        """
+        批量加载图片：内存命中的立即发出，其余提交到线程池；
+        priority=True 时以较高优先级排在已排队任务之前
+        
+        Returns:
+            int: 立即从内存缓存返回的数量
+        """
+        hits = 0
+        for url in urls:
+            if url in self.active_workers:
+                self._add_waiter(url, thumbnail_size)
+                continue
+            if self._emit_from_memory(url, thumbnail_size):
+                hits += 1
+                continue
+            if self._emit_cached_failure(url):
+                continue
+            self._submit(url, thumbnail_size, 1 if priority else 0)
+        return hits
+    
+    def find_cached(self, url: str, size: Optional[Tuple[int, int]] = None) -> Optional[QPixmap]:
+        """在内存缓存（QPixmapCache）中查找指定尺寸的图片"""
+        return self._cache_find(_pixmap_key(url, size))
+    
+    def cache_pixmap(self, url: str, size: Optional[Tuple[int, int]], pixmap: QPixmap):
+        """将图片按URL与尺寸写入内存缓存（QPixmapCache，经过准入过滤）"""
+        self._cache_insert(_pixmap_key(url, size), pixmap)
+    
+    def _cache_find(self, key: str) -> Optional[QPixmap]:
+        """查找并记录一次访问（命中与未命中都计入频率）"""
+        self._sketch.record(key)
+        pixmap = QPixmapCache.find(key)
+        if key in self._resident:
+            if pixmap is None:
+                # 已被 QPixmapCache 自身淘汰
+                self._resident_bytes -= self._resident.pop(key)
+            else:
+                self._resident.move_to_end(key)
+        return pixmap
+    
+    def _cache_insert(self, key: str, pixmap: QPixmap) -> bool:
+        """按 TinyLFU 准入写入，返回是否写入"""
+        nbytes = pixmap.width() * pixmap.height() * 4
+        old = self._resident.pop(key, None)
+        if old is not None:
+            self._resident_bytes -= old
+        elif self._resident and self._resident_bytes + nbytes > self._memory_budget:
+            # 只与最久未用的条目比较一次频率
+            victim = next(iter(self._resident))
+            if self._sketch.frequency(key) <= self._sketch.frequency(victim):
+                return False
+            while self._resident and self._resident_bytes + nbytes > self._memory_budget:
+                victim, victim_bytes = self._resident.popitem(last=False)
+                self._resident_bytes -= victim_bytes
+                QPixmapCache.remove(victim)
+        if not QPixmapCache.insert(key, pixmap):
+            return False
+        self._resident[key] = nbytes
+        self._resident_bytes += nbytes
+        return True
+    
+    def _emit_from_memory(self, url: str, thumbnail_size: Optional[Tuple[int, int]]) -> bool:
+        """内存缓存命中时直接发出 image_loaded，返回是否命中"""
+        pixmap = self._cache_find(_pixmap_key(url, thumbnail_size))
+        if pixmap is None:
+            return False
+        self.image_loaded.emit(url, pixmap)
+        return True
+    
     def load_image(self, url: str, thumbnail_size: Optional[Tuple[int, int]] = None) -> bool:
         """加载图片（支持缩略图尺寸缓存复用）"""
-        # 检查是否已经在加载
+        # 已经在加载：合并到同一任务，不重复下载
         if url in self.active_workers:
-            return False
+            self._add_waiter(url, thumbnail_size)
+            return True
         
-        # 先检查内存缓存（优先尺寸变体，其次原始）
-        base_key = self.cache_manager.get_cache_key(url)
-        variant_key = None
-        if thumbnail_size:
-            variant_key = self.cache_manager.get_cache_key(f"{url}|{thumbnail_size[0]}x{thumbnail_size[1]}")
-        pixmap = None
-        if variant_key:
-            pixmap = self.cache_manager.get_from_memory(variant_key)
-        if pixmap is None:
-            pixmap = self.cache_manager.get_from_memory(base_key)
-            # 若找到原始但需要缩略图，直接缩放并写入变体缓存，避免启动线程
-            if pixmap is not None and variant_key:
-                scaled = pixmap.scaled(
-                    thumbnail_size[0], thumbnail_size[1],
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.cache_manager.put_to_memory(variant_key, scaled)
-                self.image_loaded.emit(url, scaled)
-                return True
-        if pixmap is not None:
-            self.image_loaded.emit(url, pixmap)
+        if self._emit_from_memory(url, thumbnail_size):
             return True
         
-        if len(self.active_workers) >= self.max_concurrent:
-            if (url, thumbnail_size) not in self.pending_requests:
-                self.pending_requests.append((url, thumbnail_size))
-            if not self._dispatch_timer.isActive():
-                self._dispatch_timer.start(self._min_launch_interval_ms)
+        if self._emit_cached_failure(url):
             return False
         
-        # 创建工作线程
-        import time
-        now_ms = int(time.perf_counter() * 1000)
-        if (now_ms - self._last_launch_ms) < self._min_launch_interval_ms:
-            if (url, thumbnail_size) not in self.pending_requests:
-                self.pending_requests.append((url, thumbnail_size))
-            if not self._dispatch_timer.isActive():
-                self._dispatch_timer.start(self._min_launch_interval_ms)
+        self._submit(url, thumbnail_size)
+        return True
+    
+    def _emit_cached_failure(self, url: str) -> bool:
+        """URL 最近加载失败时复用上次的失败结果，返回是否命中"""
+        entry = self._failures.get(url)
+        if entry is None:
+            return False
+        if _monotonic() - entry[0] > _FAILURE_TTL:
+            del self._failures[url]
             return False
-        self._last_launch_ms = now_ms
+        # 推迟到下一轮事件循环再发出：调用方（如缩略图构造函数内发起加载）
+        # 可能尚未完成登记，同步发出会使失败信号被丢弃
+        QTimer.singleShot(0, functools.partial(self.load_failed.emit, url, entry[1]))
+        return True
+    
+    def _submit(self, url: str, thumbnail_size: Optional[Tuple[int, int]], priority: int = 0):
+        """创建加载任务并提交到线程池，超出并发上限的由线程池排队"""
         worker = ImageLoadWorker(url, self.cache_manager, thumbnail_size)
-        worker.image_loaded.connect(self._on_image_loaded)
-        worker.load_failed.connect(self._on_load_failed)
-        worker.finished.connect(lambda: self._on_worker_finished(url))
+        worker.signals.image_decoded.connect(self._on_image_loaded)
+        worker.signals.load_failed.connect(self._on_load_failed)
+        worker.signals.finished.connect(self._on_worker_finished)
         self.active_workers[url] = worker
-        self._start_ts[url] = time.perf_counter()
-        worker.start()
-        return True
+        self.pool.start(worker, priority)
+        # 线程已占满、任务需要排队时，先预读它的磁盘缓存
+        if len(self.active_workers) > self.pool.maxThreadCount():
+            self._prefetch_pool.start(_DiskPrefetchTask(self.cache_manager, url, thumbnail_size))
+    
+    def _add_waiter(self, url: str, thumbnail_size: Optional[Tuple[int, int]]):
+        """登记对正在加载的URL的其他尺寸请求（同尺寸的请求直接共享结果信号）"""
+        if thumbnail_size == self.active_workers[url].size:
+            return
+        waiters = self._waiters.setdefault(url, [])
+        if thumbnail_size not in waiters:
+            waiters.append(thumbnail_size)
+    
+    def _serve_waiters(self, url: str, source: Optional[QPixmap], source_size: Optional[Tuple[int, int]], waiters):
+        """用刚完成的加载结果满足挂起的其他尺寸请求"""
+        if source is None:
+            # 加载失败（失败信号已按URL发出）
+            return
+        remaining = []
+        for size in waiters:
+            if self._emit_from_memory(url, size):
+                continue
+            if source_size is None or (size and size[0] <= source_size[0] and size[1] <= source_size[1]):
+                scaled = _scale_for_thumb(source, size[0], size[1]) if size else source
+                self.cache_pixmap(url, size, scaled)
+                self.image_loaded.emit(url, scaled)
+            else:
+                # 需要比已解码结果更大的尺寸：重新提交，原始数据已在磁盘缓存中
+                remaining.append(size)
+        if remaining:
+            self._submit(url, remaining[0])
+            if len(remaining) > 1:
+                self._waiters[url] = remaining[1:]
     
-    def _on_image_loaded(self, url: str, pixmap: QPixmap):
-        """图片加载成功"""
+    def _on_image_loaded(self, url: str, decoded):
+        """图片加载成功（GUI 线程）：QImage 转为 QPixmap"""
         try:
-            st = self._start_ts.pop(url, None)
+            pixmap = QPixmap.fromImage(decoded[0])
+        except Exception as e:
+            self._on_load_failed(url, f"加载失败: {str(e)}")
+            return
+        try:
+            # 耗时从任务开始执行算起，不含在线程池中排队的时间
+            worker = self.active_workers.get(url)
+            st = worker.started_at if worker is not None else None
             if st is not None:
-                self._sum_load_ms += (time.perf_counter() - st) * 1000.0
                 self._count_loaded += 1
+                self._mean_ms += ((_perf() - st) * 1000.0 - self._mean_ms) / self._count_loaded
+            # 工作线程不能访问 QPixmapCache，结果在 GUI 线程写入
+            self._failures.pop(url, None)
+            if worker is not None:
+                worker.result = pixmap
+                self._cache_insert(_pixmap_key(url, worker.size), pixmap)
         except Exception:
             pass
         self.image_loaded.emit(url, pixmap)
     
     def _on_load_failed(self, url: str, error: str):
         """图片加载失败"""
-        try:
-            self._start_ts.pop(url, None)
-        except Exception:
-            pass
+        if len(self._failures) >= _FAILURE_CACHE_MAX:
+            self._failures.clear()
+        self._failures[url] = (_monotonic(), error)
         self.load_failed.emit(url, error)
     
-    def _on_worker_finished(self, url: str):
-        """工作线程完成"""
-        if url in self.active_workers:
-            worker = self.active_workers.pop(url)
-            worker.deleteLater()
-        
-        if self.pending_requests:
-            if not self._dispatch_timer.isActive():
-                self._dispatch_timer.start(self._min_launch_interval_ms)
-
-    def _dispatch_pending(self):
-        import time
-        now_ms = int(time.perf_counter() * 1000)
-        if (now_ms - self._last_launch_ms) < self._min_launch_interval_ms:
-            self._dispatch_timer.start(self._min_launch_interval_ms)
-            return
-        while self.pending_requests and len(self.active_workers) < self.max_concurrent:
-            next_url, next_size = self.pending_requests.pop(0)
-            started = self.load_image(next_url, next_size)
-            if started:
-                now_ms = int(time.perf_counter() * 1000)
-                self._last_launch_ms = now_ms
-            else:
-                break
+    def _on_worker_finished(self, worker):
+        """加载任务完成（同一URL可能已被取消后重新提交，只移除对应的任务）"""
+        url = worker.url
+        if self.active_workers.get(url) is worker:
+            del self.active_workers[url]
+            waiters = self._waiters.pop(url, None)
+            if waiters:
+                self._serve_waiters(url, worker.result, worker.size, waiters)
     
     def cancel_load(self, url: str):
-        """取消加载"""
-        if url in self.active_workers:
-            worker = self.active_workers.pop(url)
+        """取消加载：排队中的任务直接移出线程池，执行中的任务在检查点自行退出"""
+        worker = self.active_workers.pop(url, None)
+        self._waiters.pop(url, None)
+        if worker is not None:
             self._cancel_count += 1
-            worker.terminate()
-            worker.wait()
-            worker.deleteLater()
-        
-        if url in self.pending_requests:
-            self.pending_requests.remove(url)
+            if self.pool.tryTake(worker):
+                # 尚未开始执行，不会再发出任何信号
+                return
+            worker.canceled = True
     
     def cancel_all(self):
         """取消所有加载"""
-        # 终止所有活跃的工作线程
+        # 清空线程池中尚未开始的任务，执行中的任务标记为已取消
+        self.pool.clear()
+        self._prefetch_pool.clear()
+        self._cancel_count += len(self.active_workers)
         for worker in self.active_workers.values():
-            self._cancel_count += 1
-            worker.terminate()
-            worker.wait()
-            worker.deleteLater()
-        
+            worker.canceled = True
         self.active_workers.clear()
-        self.pending_requests.clear()
+        self._waiters.clear()
     
     def get_load_stats(self):
         """获取加载统计"""
-        avg_ms = (self._sum_load_ms / self._count_loaded) if self._count_loaded > 0 else 0.0
+        active = self.pool.activeThreadCount()
         return {
-            "active_loads": len(self.active_workers),
-            "pending_loads": len(self.pending_requests),
+            "active_loads": active,
+            "pending_loads": max(0, len(self.active_workers) - active),
             "max_concurrent": self.max_concurrent,
             "loaded_count": self._count_loaded,
             "cancel_count": self._cancel_count,
-            "avg_load_ms": avg_ms
+            "avg_load_ms": self._mean_ms
         }
 
     def set_max_concurrent(self, n: int):
@@ -270,6 +637,7 @@ class ImageLoader(QObject):
         except Exception:
             return
         self.max_concurrent = max(1, n)
+        self.pool.setMaxThreadCount(self.max_concurrent)
 
     def get_max_concurrent(self) -> int:
         return int(self.max_concurrent)
@@ -4,45 +4,121 @@
 """
 
 import os
+import time
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QScrollArea, QWidget, QTextEdit,
                              QSplitter, QFrame, QProgressBar, QTextBrowser,
                              QMenu, QApplication, QGraphicsView, QGraphicsScene,
-                             QGraphicsPixmapItem, QGraphicsTextItem, QStackedLayout,
+                             QGraphicsPixmapItem, QGraphicsTextItem, QGraphicsItem, QStackedLayout,
                              QMainWindow, QFileDialog, QMessageBox, QSizePolicy, QToolButton)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QUrl, QThread, pyqtSlot, QPoint, QPointF, QEvent
-from PyQt6.QtGui import QPixmap, QFont, QKeySequence, QShortcut, QCursor, QFontMetrics
-from PyQt6.QtGui import QTransform, QAction, QPainter, QColor
+from PyQt6.QtGui import QPixmap, QImage, QFont, QKeySequence, QShortcut, QCursor, QFontMetrics
+from PyQt6.QtGui import QTransform, QAction, QPainter, QColor, QOpenGLContext
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 import asyncio
+import concurrent.futures
 import aiohttp
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from lxml import etree
+from urllib.parse import urljoin, urlparse
 from .gif_player import GifPlayer
 from .video_controls import VideoControls
 from ...core.i18n import I18n
 from ...core.config import Config
 from ...integrations.sd_cdp import send_to_sd
+from ..threads._async_runtime import PendingFutures, ensure_shared_loop
+
+try:
+    from PyQt6.QtOpenGLWidgets import QOpenGLWidget  # 可选：部分 PyQt6 发行版不含 OpenGL 模块
+except ImportError:
+    QOpenGLWidget = None
+
+# 下载分块大小：8 KiB 时吞吐明显偏低，约 100 KiB 以上趋于平稳
+_DOWNLOAD_CHUNK_SIZE = 128 * 1024
+# 进度信号最小间隔（秒）：跨线程信号在 GUI 事件队列中排队，约 20Hz 即足够流畅
+_PROGRESS_INTERVAL = 0.05
+
+# 查看器共享的 aiohttp 会话：仅在共享事件循环上创建和使用，
+# 翻页浏览同一站点时复用 TCP/TLS 连接与 DNS 缓存
+_SESSION: aiohttp.ClientSession | None = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """返回共享的 aiohttp 会话；必须在共享事件循环中调用。"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(limit_per_host=6, ttl_dns_cache=300)
+        _SESSION = aiohttp.ClientSession(trust_env=True, connector=connector)
+    return _SESSION
+
+
+# OpenGL 是否可用（首次创建查看器时探测一次）
+_GL_AVAILABLE: bool | None = None
+
+
+def _gl_available() -> bool:
+    """探测能否创建 OpenGL 上下文；无 GPU/远程桌面/虚拟机等环境下返回 False"""
+    global _GL_AVAILABLE
+    if _GL_AVAILABLE is None:
+        ok = False
+        if QOpenGLWidget is not None:
+            try:
+                if Config().get('appearance.opengl_viewer', True):
+                    ok = QOpenGLContext().create()
+            except Exception:
+                ok = False
+        _GL_AVAILABLE = ok
+    return _GL_AVAILABLE
+
 
 class ImageDownloadThread(QThread):
     """图片下载线程"""
     
-    download_finished = pyqtSignal(bytes)
+    download_finished = pyqtSignal(bytes, object)  # 原始数据, 已解码的 QImage（未解码或解码失败为 None）
     download_failed = pyqtSignal(str)
     download_progress = pyqtSignal(int, int)  # current, total
     
-    def __init__(self, url: str):
+    def __init__(self, url: str, decode: bool = True):
         super().__init__()
         self.url = url
-        self.session = None
+        # 是否在本线程预先解码（GIF 交给 GifPlayer 逐帧解码，无需预解码）
+        self.decode = decode
+        self._futures = PendingFutures()
+
+    def cancel(self):
+        """取消下载：取消共享事件循环上的协程，run() 随即返回"""
+        self.requestInterruption()
+        self._futures.cancel()
     
     def run(self):
-        """运行下载"""
-        asyncio.run(self.download_image())
+        """运行下载：协程提交到共享事件循环，本线程等待数据后负责解码"""
+        if self.isInterruptionRequested():
+            return
+        fut = asyncio.run_coroutine_threadsafe(self.download_image(), ensure_shared_loop())
+        self._futures.add(fut)
+        try:
+            data = fut.result()
+        except concurrent.futures.CancelledError:
+            return
+        except Exception:
+            return
+        finally:
+            self._futures.clear()
+        if data is None or self.isInterruptionRequested():
+            return
+        # 在工作线程中解码（QImage 可重入），GUI 线程只需 QPixmap.fromImage 转换
+        image = None
+        if self.decode:
+            try:
+                image = QImage.fromData(data)
+                if image.isNull():
+                    image = None
+            except Exception:
+                image = None
+        self.download_finished.emit(data, image)
     
-    async def download_image(self):
-        """异步下载图片"""
+    async def download_image(self) -> bytes | None:
+        """异步下载图片；成功返回数据，失败时发出 download_failed 并返回 None"""
         try:
             timeout = aiohttp.ClientTimeout(total=60)
             cfg = Config()
@@ -60,34 +136,44 @@ class ImageDownloadThread(QThread):
                             proxy_url = f"http://{host}:{port}"
             except Exception:
                 proxy_url = None
-            async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-                headers = None
-                try:
-                    from urllib.parse import urlparse
-                    netloc = (urlparse(self.url).netloc or '').lower()
-                    if 'yande.re' in netloc:
-                        headers = {
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-                            'Referer': 'https://yande.re',
-                            'Accept': '*/*',
-                        }
-                except Exception:
-                    headers = None
-                async with session.get(self.url, headers=headers, proxy=proxy_url) as response:
-                    if response.status == 200:
-                        total_size = int(response.headers.get('content-length', 0))
-                        downloaded = 0
-                        data = b''
-                        
-                        async for chunk in response.content.iter_chunked(8192):
-                            data += chunk
-                            downloaded += len(chunk)
-                            if total_size > 0:
+            session = await _get_session()
+            headers = None
+            if 'yande.re' in (urlparse(self.url).netloc or '').lower():
+                headers = {
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+                    'Referer': 'https://yande.re',
+                    'Accept': '*/*',
+                }
+            async with session.get(self.url, headers=headers, proxy=proxy_url, timeout=timeout) as response:
+                if response.status == 200:
+                    total_size = int(response.headers.get('content-length', 0))
+                    downloaded = 0
+                    last_emit = 0.0
+                    # 已知 Content-Length 时预分配目标缓冲区并按偏移写入，避免扩容重分配；
+                    # 未知时退回 bytearray 原地扩展
+                    buf = bytearray(total_size) if total_size > 0 else bytearray()
+                    
+                    async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                        end = downloaded + len(chunk)
+                        if end <= len(buf):
+                            buf[downloaded:end] = chunk
+                        else:
+                            # 实际长度超出声明值（如服务端长度不准）：截断到已写部分后追加
+                            del buf[downloaded:]
+                            buf.extend(chunk)
+                        downloaded = end
+                        if total_size > 0:
+                            now = time.monotonic()
+                            # 按时间节流，但始终发出最后一次（完成）进度
+                            if now - last_emit >= _PROGRESS_INTERVAL or downloaded >= total_size:
+                                last_emit = now
                                 self.download_progress.emit(downloaded, total_size)
-                        
-                        self.download_finished.emit(data)
-                    else:
-                        self.download_failed.emit(f"HTTP错误: {response.status}")
+                    
+                    # 实际长度可能短于声明值，仅交出已写入部分
+                    if downloaded < len(buf):
+                        del buf[downloaded:]
+                    return bytes(buf)
+                self.download_failed.emit(f"HTTP错误: {response.status}")
         except aiohttp.ClientError as e:
             try:
                 self.download_failed.emit(f"网络错误: {e}")
@@ -109,19 +195,59 @@ class MoebooruResolveFileUrlThread(QThread):
     resolved = pyqtSignal(dict)  # {file_url, ext}
     failed = pyqtSignal(str)
 
+    # 帖子页原图链接的预编译 XPath，按优先级排列；每项只取文档中第一个匹配元素
+    _HIGHRES_XPATHS = (
+        etree.XPath("(//a[@id='highres'])[1]/@href"),
+        etree.XPath("(//a[contains(concat(' ', normalize-space(@class), ' '), ' directlink ')])[1]/@href"),
+    )
+    _IMAGE_XPATHS = (
+        etree.XPath("(//img[@id='image'])[1]"),
+        etree.XPath("(//img[contains(concat(' ', normalize-space(@class), ' '), ' image ')])[1]"),
+    )
+    _IMAGE_URL_ATTRS = ('data-file-url', 'data-original', 'data-large-src', 'data-src', 'src')
+    # 单次遍历找出第一个符合条件的链接；translate() 实现 ASCII 关键字的大小写无关匹配
+    _LINK_SCAN_XPATH = etree.XPath(
+        "(//a[@href != ''][("
+        "contains(translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'original')"
+        " or contains(translate(string(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'download')"
+        " or contains(string(.), '原图') or contains(string(.), '下载')"
+        ") or ("
+        "(contains(@href, '/image/') or contains(@href, '/data/')"
+        " or contains(@href, '/jpeg/') or contains(@href, '/png/'))"
+        " and (substring(@href, string-length(@href) - 3) = '.jpg'"
+        " or substring(@href, string-length(@href) - 4) = '.jpeg'"
+        " or substring(@href, string-length(@href) - 3) = '.png'"
+        " or substring(@href, string-length(@href) - 3) = '.gif')"
+        ")])[1]/@href"
+    )
+    _OG_IMAGE_XPATH = etree.XPath("(//meta[@property='og:image'])[1]/@content")
+
     def __init__(self, post_url: str):
         super().__init__()
         self.post_url = post_url
+        self._futures = PendingFutures()
+
+    def cancel(self):
+        """取消解析：取消共享事件循环上的协程，run() 随即返回"""
+        self.requestInterruption()
+        self._futures.cancel()
 
     def run(self):
+        if self.isInterruptionRequested():
+            return
+        fut = asyncio.run_coroutine_threadsafe(self._resolve(), ensure_shared_loop())
+        self._futures.add(fut)
         try:
-            asyncio.run(self._resolve())
+            fut.result()
+        except concurrent.futures.CancelledError:
+            pass
         except Exception as e:
             self.failed.emit(f"解析异常: {e}")
+        finally:
+            self._futures.clear()
 
     async def _resolve(self):
         timeout = aiohttp.ClientTimeout(total=30)
-        from urllib.parse import urlparse
         p = urlparse(self.post_url)
         base = 'https://konachan.net' if 'konachan.net' in (p.netloc or '') else 'https://yande.re'
         headers = {
@@ -145,102 +271,90 @@ class MoebooruResolveFileUrlThread(QThread):
                         proxy_url = f"http://{host}:{port}"
         except Exception:
             proxy_url = None
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers, trust_env=True) as session:
+        session = await _get_session()
+        html = None
+        try:
+            async with session.get(self.post_url, headers=headers, timeout=timeout,
+                                   allow_redirects=True, proxy=proxy_url) as resp:
+                if resp.status == 200:
+                    html = await resp.text()
+        except Exception:
             html = None
-            try:
-                async with session.get(self.post_url, allow_redirects=True, proxy=proxy_url) as resp:
-                    if resp.status == 200:
-                        html = await resp.text()
-            except Exception:
-                html = None
-            if html:
-                fu = self._extract_file_url(html)
-                if fu:
-                    abs_url = urljoin(self.post_url, fu)
-                    ext = abs_url.split('?')[0].split('.')[-1].lower()
-                    self.resolved.emit({'file_url': abs_url, 'ext': ext})
-                    return
-            segs = [s for s in (p.path or '').split('/') if s]
-            pid = ''
-            for s in reversed(segs):
-                if s.isdigit():
-                    pid = s
-                    break
-            if not pid:
-                self.failed.emit("未找到原图链接")
+        if html:
+            # HTML 解析为 CPU 密集操作，放到线程池执行，避免阻塞共享事件循环上的其它请求
+            fu = await asyncio.get_running_loop().run_in_executor(None, self._extract_file_url, html)
+            if fu:
+                abs_url = urljoin(self.post_url, fu)
+                ext = abs_url.split('?')[0].split('.')[-1].lower()
+                self.resolved.emit({'file_url': abs_url, 'ext': ext})
                 return
-            api_url = f"{base}/post.json?tags=id:{pid}"
-            async with session.get(api_url, proxy=proxy_url) as r:
-                if r.status != 200:
-                    self.failed.emit(f"HTTP错误: {r.status}")
-                    return
-                try:
-                    data = await r.json()
-                except Exception as e:
-                    self.failed.emit(f"解析异常: {e}")
-                    return
-            if not isinstance(data, list) or not data:
-                self.failed.emit("未找到原图链接")
+        segs = [s for s in (p.path or '').split('/') if s]
+        pid = ''
+        for s in reversed(segs):
+            if s.isdigit():
+                pid = s
+                break
+        if not pid:
+            self.failed.emit("未找到原图链接")
+            return
+        api_url = f"{base}/post.json?tags=id:{pid}"
+        async with session.get(api_url, headers=headers, timeout=timeout, proxy=proxy_url) as r:
+            if r.status != 200:
+                self.failed.emit(f"HTTP错误: {r.status}")
                 return
-            d = data[0]
-            url = d.get('file_url') or d.get('jpeg_url') or d.get('sample_url') or d.get('source')
-            if not url:
-                self.failed.emit("未找到原图链接")
+            try:
+                data = await r.json()
+            except Exception as e:
+                self.failed.emit(f"解析异常: {e}")
                 return
-            abs_url = urljoin(base, url)
-            ext = abs_url.split('?')[0].split('.')[-1].lower()
-            self.resolved.emit({'file_url': abs_url, 'ext': ext})
+        if not isinstance(data, list) or not data:
+            self.failed.emit("未找到原图链接")
+            return
+        d = data[0]
+        url = d.get('file_url') or d.get('jpeg_url') or d.get('sample_url') or d.get('source')
+        if not url:
+            self.failed.emit("未找到原图链接")
+            return
+        abs_url = urljoin(base, url)
+        ext = abs_url.split('?')[0].split('.')[-1].lower()
+        self.resolved.emit({'file_url': abs_url, 'ext': ext})
 
     def _extract_file_url(self, html: str) -> str | None:
-        # 采用 lxml 优先解析，失败回退到 html.parser
+        # lxml 为必需依赖（见 requirements.txt）；直接用预编译 XPath 在 C 层查找，不再构建 BeautifulSoup 树
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = etree.HTML(html)
         except Exception:
-            soup = BeautifulSoup(html, 'html.parser')
+            # 空文档或带编码声明的字符串等无法解析的情况
+            return None
+        if tree is None:
+            return None
 
         # 1) 高分辨率原图链接（常见为 a#highres 或 a.directlink）
-        try:
-            a = soup.select_one('a#highres')
-            if a and a.get('href'):
-                return a.get('href')
-            a = soup.select_one('a.directlink')
-            if a and a.get('href'):
-                return a.get('href')
-        except Exception:
-            pass
+        for xpath in self._HIGHRES_XPATHS:
+            res = xpath(tree)
+            if res and res[0]:
+                return str(res[0])
 
         # 2) 图片标签本身可能包含原图或大图链接信息
-        try:
-            img = soup.select_one('img#image') or soup.select_one('img.image')
-            if img:
-                for key in ('data-file-url', 'data-original', 'data-large-src', 'data-src', 'src'):
-                    if img.get(key):
-                        return img.get(key)
-        except Exception:
-            pass
-
-        # 3) 其它可能的原图链接：/image/、/data/、/jpeg/、/png/ 等
-        try:
-            for a in soup.find_all('a'):
-                href = a.get('href') or ''
-                if not href:
-                    continue
-                text = (a.get_text() or '').strip().lower()
-                if any(k in text for k in ('original', 'download', '原图', '下载')):
-                    return href
-                if any(seg in href for seg in ('/image/', '/data/', '/jpeg/', '/png/')):
-                    if href.endswith(('.jpg', '.jpeg', '.png', '.gif')):
-                        return href
-        except Exception:
-            pass
+        for xpath in self._IMAGE_XPATHS:
+            res = xpath(tree)
+            if res:
+                img = res[0]
+                for key in self._IMAGE_URL_ATTRS:
+                    value = img.get(key)
+                    if value:
+                        return value
+                break
+
+        # 3) 其它可能的原图链接：文字含“原图/下载”，或 /image/、/data/、/jpeg/、/png/ 下的图片文件
+        res = self._LINK_SCAN_XPATH(tree)
+        if res:
+            return str(res[0])
 
         # 4) 作为回退，尝试 og:image（可能是样图，但有时也是原图）
-        try:
-            meta = soup.find('meta', attrs={'property': 'og:image'})
-            if meta and meta.get('content'):
-                return meta.get('content')
-        except Exception:
-            pass
+        res = self._OG_IMAGE_XPATH(tree)
+        if res and res[0]:
+            return str(res[0])
 
         return None
 
@@ -255,7 +369,24 @@ class ZoomableImageLabel(QGraphicsView):
         # 场景与图元
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
+        # OpenGL 视口：缩放/平移时的像素采样交给 GPU；不可用时保持默认光栅视口
+        use_gl = False
+        if _gl_available():
+            try:
+                self.setViewport(QOpenGLWidget())
+                # GL 视口不绘制样式表背景，用场景背景画刷保持原有底色
+                self.setBackgroundBrush(QColor("#1e1e1e"))
+                # QOpenGLWidget 不保留上一帧内容，局部重绘会在脏区外留下残影/黑块，必须整视口重绘
+                self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+                use_gl = True
+            except Exception:
+                pass
         self.pixmap_item = QGraphicsPixmapItem()
+        if not use_gl:
+            # 光栅视口：按设备坐标缓存图元绘制结果，平移与重复重绘直接复用缓存，不再逐次重采样。
+            # GL 视口下保持 NoCache：设备坐标缓存会在 CPU 上重新缩放到缓存位图，GPU 只做拷贝，
+            # 且 GIF 每帧 setPixmap 都会使缓存失效
+            self.pixmap_item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.scene.addItem(self.pixmap_item)
         self.text_item = QGraphicsTextItem("")
         self.text_item.setDefaultTextColor(QColor("#cccccc"))
@@ -268,6 +399,8 @@ class ZoomableImageLabel(QGraphicsView):
         self.flip_horizontal_flag = False
         self.flip_vertical_flag = False
         self.original_pixmap = None
+        # 最近一次应用到图元的 (旋转, 水平镜像, 垂直镜像)，未变化时不重设图元变换
+        self._item_transform_key = None
         self.setMinimumSize(400, 300)
         self.setStyleSheet("border: 1px solid #666; background-color: #1e1e1e;")
         # 居中对齐，确保缩小时图片仍保持在中心
@@ -279,6 +412,8 @@ class ZoomableImageLabel(QGraphicsView):
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         self.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        # 场景中的图元绘制后自行恢复画笔状态，无需视图逐项保存/恢复
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
@@ -289,13 +424,36 @@ class ZoomableImageLabel(QGraphicsView):
         # 取消拖拽阈值，始终允许拖拽
         self.drag_enable_threshold = 0.0
 
+        # 滚轮缩放合并：高频滚轮事件只修改 scale_factor，约一帧（16ms）内统一刷新一次
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(16)
+        self._zoom_timer.timeout.connect(self.update_display)
+
+        # 设备像素比缓存：仅在显示、切换屏幕或主屏变化时刷新，get_dpr() 直接返回缓存值
+        self._cached_dpr = 1.0
+        self._screen_signal_connected = False
+        self._refresh_dpr()
+        try:
+            QApplication.instance().primaryScreenChanged.connect(self._refresh_dpr)
+        except Exception:
+            pass
+
         # 启用鼠标跟踪和右键菜单
         self.setMouseTracking(True)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
 
     def get_dpr(self) -> float:
-        """获取当前屏幕设备像素比（DPR）"""
+        """获取当前屏幕设备像素比（DPR，缓存值）"""
+        return self._cached_dpr
+
+    def _refresh_dpr(self, *args):
+        """重新查询并缓存设备像素比"""
+        self._cached_dpr = self._query_dpr()
+
+    def _query_dpr(self) -> float:
+        """查询当前屏幕设备像素比：优先窗口所在屏幕，其次主屏"""
         try:
             win = self.window()
             if win and hasattr(win, 'windowHandle') and win.windowHandle():
@@ -349,23 +507,31 @@ class ZoomableImageLabel(QGraphicsView):
             # 兜底：若出现异常，至少不崩溃
             self.text_item.setVisible(True)
     
+    def _apply_item_transform(self):
+        """图元变换：仅负责旋转与镜像；状态未变化时跳过，避免图元缓存失效"""
+        key = (self.rotation_degrees % 360, self.flip_horizontal_flag, self.flip_vertical_flag)
+        if key == self._item_transform_key:
+            return
+        self._item_transform_key = key
+        item_transform = QTransform()
+        if self.rotation_degrees % 360 != 0:
+            item_transform.rotate(self.rotation_degrees)
+        if self.flip_horizontal_flag:
+            item_transform.scale(-1, 1)
+        if self.flip_vertical_flag:
+            item_transform.scale(1, -1)
+        self.pixmap_item.setTransform(item_transform)
+
     def update_display(self):
         """更新显示"""
         if self.original_pixmap:
-            # 图元变换：仅负责旋转与镜像
-            item_transform = QTransform()
-            if self.rotation_degrees % 360 != 0:
-                item_transform.rotate(self.rotation_degrees)
-            if self.flip_horizontal_flag:
-                item_transform.scale(-1, 1)
-            if self.flip_vertical_flag:
-                item_transform.scale(1, -1)
-            self.pixmap_item.setTransform(item_transform)
-
-            # 视图缩放：负责缩放并保持居中
+            self._apply_item_transform()
+
+            # 视图缩放：负责缩放并保持居中；与当前变换相同时不重设
             view_transform = QTransform()
             view_transform.scale(self.scale_factor, self.scale_factor)
-            self.setTransform(view_transform)
+            if self.transform() != view_transform:
+                self.setTransform(view_transform)
             try:
                 self.zoom_changed.emit(self.scale_factor)
             except Exception:
@@ -401,14 +567,7 @@ class ZoomableImageLabel(QGraphicsView):
             # 计算旋转/镜像后的包围盒（使用图元变换后的场景边界）
             # 需要使用 QPointF 而不是 QPoint
             self.pixmap_item.setTransformOriginPoint(QPointF(self.original_pixmap.rect().center()))
-            item_transform = QTransform()
-            if self.rotation_degrees % 360 != 0:
-                item_transform.rotate(self.rotation_degrees)
-            if self.flip_horizontal_flag:
-                item_transform.scale(-1, 1)
-            if self.flip_vertical_flag:
-                item_transform.scale(1, -1)
-            self.pixmap_item.setTransform(item_transform)
+            self._apply_item_transform()
 
             rect = self.pixmap_item.sceneBoundingRect()
             view_size = self.viewport().size()
@@ -448,7 +607,9 @@ class ZoomableImageLabel(QGraphicsView):
         else:
             self.scale_factor = max(self.scale_factor / 1.15, 0.1)
         if self.original_pixmap and old_scale != self.scale_factor:
-            self.update_display()
+            # 单次定时器：连续滚动时合并为每帧一次刷新
+            if not self._zoom_timer.isActive():
+                self._zoom_timer.start()
         # 阻止滚轮滚动默认行为
         event.accept()
     
@@ -489,6 +650,19 @@ class ZoomableImageLabel(QGraphicsView):
         self.setCursor(QCursor(Qt.CursorShape.OpenHandCursor))
         super().mouseReleaseEvent(event)
 
+    def showEvent(self, event):
+        """显示时刷新 DPR，并在窗口句柄可用后订阅屏幕切换"""
+        super().showEvent(event)
+        if not self._screen_signal_connected:
+            try:
+                handle = self.window().windowHandle()
+                if handle:
+                    handle.screenChanged.connect(self._refresh_dpr)
+                    self._screen_signal_connected = True
+            except Exception:
+                pass
+        self._refresh_dpr()
+
     def resizeEvent(self, event):
         """窗口尺寸变化时保持居中"""
         super().resizeEvent(event)
@@ -572,6 +746,107 @@ class ZoomableImageLabel(QGraphicsView):
             clipboard.setPixmap(self.original_pixmap)
 
 
+# 查看器各部件的样式表：在模块级构建一次，各对话框实例共用同一字符串对象
+_TAGS_TEXT_QSS = """
+QTextBrowser { 
+    background: transparent; 
+    border: none; 
+    font-size: 13px; 
+}
+QTextBrowser QScrollBar:vertical {
+    background: transparent;
+    width: 12px;
+    margin: 0;
+}
+QTextBrowser QScrollBar::handle:vertical {
+    background: #5a5a5a;
+    min-height: 20px;
+    border-radius: 6px;
+}
+QTextBrowser QScrollBar::handle:vertical:hover {
+    background: #787878;
+}
+QTextBrowser QScrollBar::add-line:vertical,
+QTextBrowser QScrollBar::sub-line:vertical {
+    height: 0px;
+    background: none;
+}
+QTextBrowser QScrollBar::add-page:vertical,
+QTextBrowser QScrollBar::sub-page:vertical {
+    background: none;
+}
+a { 
+    display: block;
+    width: 100%;
+    color: #e0e0e0; 
+    background-color: #3e3e3e; 
+    padding: 6px 10px; 
+    border-radius: 8px; 
+    text-decoration: none; 
+    margin: 4px 0; 
+}
+a:hover { 
+    background-color: #5a5a5a; 
+}
+"""
+
+_PROGRESS_BAR_QSS = """
+QProgressBar {
+    min-height: 18px;
+    max-height: 18px;
+    border: 1px solid #3a3a3a;
+    border-radius: 9px;
+    background-color: #1e1e1e;
+    padding: 1px;
+    text-align: right;
+}
+QProgressBar::chunk {
+    background-color: #2aa7ff;
+    border-radius: 9px;
+}
+"""
+
+_INFO_FRAME_QSS = """
+QFrame {
+    background: transparent;
+    border: none;
+    padding: 0px;
+}
+"""
+
+_INFO_TEXT_QSS = """
+QTextBrowser {
+    background: transparent;
+    border: none;
+    font-size: 13px;
+}
+QTextBrowser QScrollBar:vertical {
+    background: transparent;
+    width: 12px;
+    margin: 0;
+}
+QTextBrowser QScrollBar::handle:vertical {
+    background: #5a5a5a;
+    min-height: 20px;
+    border-radius: 6px;
+}
+QTextBrowser QScrollBar::handle:vertical:hover {
+    background: #787878;
+}
+QTextBrowser QScrollBar::add-line:vertical,
+QTextBrowser QScrollBar::sub-line:vertical {
+    height: 0px;
+    background: none;
+}
+QTextBrowser QScrollBar::add-page:vertical,
+QTextBrowser QScrollBar::sub-page:vertical {
+    background: none;
+}
+"""
+
+_EDGE_TOGGLE_QSS = "QToolButton { background-color:#3a3a3a; border-radius:6px; padding:4px; color:#e0e0e0; font-size:16px; } QToolButton:hover { background-color:#5a5a5a; }"
+
+
 class ImageViewerDialog(QMainWindow):
     """图片查看器窗口"""
     
@@ -612,6 +887,9 @@ class ImageViewerDialog(QMainWindow):
         self.gif_player = GifPlayer(self)
         self.gif_player.frame_changed.connect(self._on_gif_frame_changed)
         self.gif_player.playback_finished.connect(self._on_gif_playback_finished)
+        self.gif_player.frames_ready.connect(self._on_gif_frames_ready)
+        self.gif_player.load_failed.connect(self._on_gif_load_failed)
+        self._gif_pending_data = None
         
         # 视频控制组件
         self.video_controls = VideoControls(self)
@@ -668,50 +946,7 @@ class ImageViewerDialog(QMainWindow):
         self.tags_text.setOpenLinks(False)
         self.tags_text.setOpenExternalLinks(False)
         self.tags_text.anchorClicked.connect(self.on_tag_anchor_clicked)
-        self.tags_text.setStyleSheet(
-            """
-            QTextBrowser { 
-                background: transparent; 
-                border: none; 
-                font-size: 13px; 
-            }
-            QTextBrowser QScrollBar:vertical {
-                background: transparent;
-                width: 12px;
-                margin: 0;
-            }
-            QTextBrowser QScrollBar::handle:vertical {
-                background: #5a5a5a;
-                min-height: 20px;
-                border-radius: 6px;
-            }
-            QTextBrowser QScrollBar::handle:vertical:hover {
-                background: #787878;
-            }
-            QTextBrowser QScrollBar::add-line:vertical,
-            QTextBrowser QScrollBar::sub-line:vertical {
-                height: 0px;
-                background: none;
-            }
-            QTextBrowser QScrollBar::add-page:vertical,
-            QTextBrowser QScrollBar::sub-page:vertical {
-                background: none;
-            }
-            a { 
-                display: block;
-                width: 100%;
-                color: #e0e0e0; 
-                background-color: #3e3e3e; 
-                padding: 6px 10px; 
-                border-radius: 8px; 
-                text-decoration: none; 
-                margin: 4px 0; 
-            }
-            a:hover { 
-                background-color: #5a5a5a; 
-            }
-            """
-        )
+        self.tags_text.setStyleSheet(_TAGS_TEXT_QSS)
         self.tags_text.viewport().setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.update_tags_text()
         tags_layout.addWidget(self.tags_text)
@@ -882,23 +1117,7 @@ class ImageViewerDialog(QMainWindow):
         except Exception:
             pass
         try:
-            self.progress_bar.setStyleSheet(
-                """
-                QProgressBar {
-                    min-height: 18px;
-                    max-height: 18px;
-                    border: 1px solid #3a3a3a;
-                    border-radius: 9px;
-                    background-color: #1e1e1e;
-                    padding: 1px;
-                    text-align: right;
-                }
-                QProgressBar::chunk {
-                    background-color: #2aa7ff;
-                    border-radius: 9px;
-                }
-                """
-            )
+            self.progress_bar.setStyleSheet(_PROGRESS_BAR_QSS)
         except Exception:
             pass
         self.progress_bar.hide()
@@ -916,15 +1135,7 @@ class ImageViewerDialog(QMainWindow):
             info_frame.setFrameShadow(QFrame.Shadow.Plain)
         except Exception:
             pass
-        info_frame.setStyleSheet(
-            """
-            QFrame {
-                background: transparent;
-                border: none;
-                padding: 0px;
-            }
-            """
-        )
+        info_frame.setStyleSheet(_INFO_FRAME_QSS)
         info_frame.setFrameStyle(QFrame.Shape.NoFrame)
         info_layout = QVBoxLayout(info_frame)
         info_layout.setContentsMargins(0, 0, 0, 0)
@@ -941,37 +1152,7 @@ class ImageViewerDialog(QMainWindow):
         self.info_text = QTextBrowser()
         self.info_text.setReadOnly(True)
         self.info_text.setOpenExternalLinks(True)
-        self.info_text.setStyleSheet(
-            """
-            QTextBrowser {
-                background: transparent;
-                border: none;
-                font-size: 13px;
-            }
-            QTextBrowser QScrollBar:vertical {
-                background: transparent;
-                width: 12px;
-                margin: 0;
-            }
-            QTextBrowser QScrollBar::handle:vertical {
-                background: #5a5a5a;
-                min-height: 20px;
-                border-radius: 6px;
-            }
-            QTextBrowser QScrollBar::handle:vertical:hover {
-                background: #787878;
-            }
-            QTextBrowser QScrollBar::add-line:vertical,
-            QTextBrowser QScrollBar::sub-line:vertical {
-                height: 0px;
-                background: none;
-            }
-            QTextBrowser QScrollBar::add-page:vertical,
-            QTextBrowser QScrollBar::sub-page:vertical {
-                background: none;
-            }
-            """
-        )
+        self.info_text.setStyleSheet(_INFO_TEXT_QSS)
         # 右侧信息区域与文本自适应填充
         try:
             info_frame.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -1041,7 +1222,7 @@ class ImageViewerDialog(QMainWindow):
             self.left_toggle_btn = QToolButton(center_widget)
             self.left_toggle_btn.setText("‹")
             self.left_toggle_btn.hide()
-            self.left_toggle_btn.setStyleSheet("QToolButton { background-color:#3a3a3a; border-radius:6px; padding:4px; color:#e0e0e0; font-size:16px; } QToolButton:hover { background-color:#5a5a5a; }")
+            self.left_toggle_btn.setStyleSheet(_EDGE_TOGGLE_QSS)
             try:
                 self.left_toggle_btn.setFixedSize(28, 160)
             except Exception:
@@ -1050,7 +1231,7 @@ class ImageViewerDialog(QMainWindow):
             self.right_toggle_btn = QToolButton(center_widget)
             self.right_toggle_btn.setText("›")
             self.right_toggle_btn.hide()
-            self.right_toggle_btn.setStyleSheet("QToolButton { background-color:#3a3a3a; border-radius:6px; padding:4px; color:#e0e0e0; font-size:16px; } QToolButton:hover { background-color:#5a5a5a; }")
+            self.right_toggle_btn.setStyleSheet(_EDGE_TOGGLE_QSS)
             try:
                 self.right_toggle_btn.setFixedSize(28, 160)
             except Exception:
@@ -1360,7 +1541,7 @@ class ImageViewerDialog(QMainWindow):
         # 先取消任何仍在进行的下载线程，避免重复和销毁时崩溃
         if getattr(self, 'download_thread', None) and self.download_thread.isRunning():
             try:
-                self.download_thread.terminate()
+                self.download_thread.cancel()
                 self.download_thread.wait()
             except Exception:
                 pass
@@ -1375,7 +1556,7 @@ class ImageViewerDialog(QMainWindow):
         if site in ('konachan', 'yandere') and (not file_url) and post_url:
             if getattr(self, 'resolve_thread', None) and self.resolve_thread.isRunning():
                 try:
-                    self.resolve_thread.terminate()
+                    self.resolve_thread.cancel()
                     self.resolve_thread.wait()
                 except Exception:
                     pass
@@ -1410,7 +1591,7 @@ class ImageViewerDialog(QMainWindow):
         # 取消任何仍在进行的下载线程
         if getattr(self, 'download_thread', None) and self.download_thread.isRunning():
             try:
-                self.download_thread.terminate()
+                self.download_thread.cancel()
                 self.download_thread.wait()
             except Exception:
                 pass
@@ -1458,7 +1639,8 @@ class ImageViewerDialog(QMainWindow):
         self.progress_bar.show()
         self.progress_bar.setRange(0, 0)  # 不确定进度
         
-        self.download_thread = ImageDownloadThread(image_url)
+        ext = (self.image_data.get('file_ext') or '').lower()
+        self.download_thread = ImageDownloadThread(image_url, decode=(ext != 'gif'))
         self.download_thread.download_finished.connect(self.on_image_downloaded)
         self.download_thread.download_failed.connect(self.on_download_failed)
         self.download_thread.download_progress.connect(self.on_download_progress)
@@ -1514,7 +1696,7 @@ class ImageViewerDialog(QMainWindow):
         # 取消任何仍在进行的下载线程
         if getattr(self, 'download_thread', None) and self.download_thread.isRunning():
             try:
-                self.download_thread.terminate()
+                self.download_thread.cancel()
                 self.download_thread.wait()
             except Exception:
                 pass
@@ -1616,9 +1798,9 @@ class ImageViewerDialog(QMainWindow):
         if self.audio_output:
             self.audio_output.setMuted(muted)
     
-    @pyqtSlot(bytes)
-    def on_image_downloaded(self, data: bytes):
-        """图片下载完成"""
+    @pyqtSlot(bytes, object)
+    def on_image_downloaded(self, data: bytes, image=None):
+        """图片下载完成；image 为下载线程中已解码的 QImage（可能为 None）"""
         self.progress_bar.hide()
         
         # 检查是否为GIF文件
@@ -1630,25 +1812,10 @@ class ImageViewerDialog(QMainWindow):
                 self.image_label.show()
                 self.video_widget.hide()
                 
-                # 使用新的GIF播放器
+                # 使用新的GIF播放器：帧在后台解码，完成后由 _on_gif_frames_ready 显示
                 if self.gif_player.load_gif(data):
-                    print(f"[GIF] 成功加载GIF，帧数: {self.gif_player.get_frame_count()}")
-                    
-                    # 显示第一帧
-                    first_frame = self.gif_player.get_current_frame()
-                    if first_frame:
-                        self.image_label.set_pixmap(first_frame)
-                        self.fit_to_window()
-                        self.sync_zoom_ui()
-                    
-                    # 如果是动画GIF，开始播放
-                    if self.gif_player.is_animated():
-                        self.gif_player.play()
-                    
-                    try:
-                        self._update_action_buttons()
-                    except Exception:
-                        pass
+                    # 解码失败时用于回退到静态图片
+                    self._gif_pending_data = data
                     return
                 else:
                     print("[GIF] GIF加载失败，回退到静态图片处理")
@@ -1656,9 +1823,18 @@ class ImageViewerDialog(QMainWindow):
             except Exception as e:
                 print(f"[GIF] GIF处理异常: {e}")
         
-        # 普通静态图片处理
-        pixmap = QPixmap()
-        if pixmap.loadFromData(data):
+        self._show_static_image(data, image)
+
+    def _show_static_image(self, data: bytes, image: QImage | None = None):
+        """普通静态图片处理"""
+        if image is not None:
+            # 已在后台解码：仅做 QImage -> QPixmap 转换，不在 GUI 线程解码
+            pixmap = QPixmap.fromImage(image)
+            ok = not pixmap.isNull()
+        else:
+            pixmap = QPixmap()
+            ok = pixmap.loadFromData(data)
+        if ok:
             # 确保切换到图片视图
             self.viewer_stack.setCurrentWidget(self.image_label)
             self.image_label.show()
@@ -1674,6 +1850,35 @@ class ImageViewerDialog(QMainWindow):
         else:
             self.image_label.setText(self.i18n.t("无法解析图片数据"))
     
+    def _on_gif_frames_ready(self):
+        """GIF后台解码完成：显示第一帧并开始播放"""
+        self._gif_pending_data = None
+        print(f"[GIF] 成功加载GIF，帧数: {self.gif_player.get_frame_count()}")
+        
+        # 显示第一帧
+        first_frame = self.gif_player.get_current_frame()
+        if first_frame:
+            self.image_label.set_pixmap(first_frame)
+            self.fit_to_window()
+            self.sync_zoom_ui()
+        
+        # 如果是动画GIF，开始播放
+        if self.gif_player.is_animated():
+            self.gif_player.play()
+        
+        try:
+            self._update_action_buttons()
+        except Exception:
+            pass
+
+    def _on_gif_load_failed(self, error: str):
+        """GIF后台解码失败：回退到静态图片处理"""
+        data = self._gif_pending_data
+        self._gif_pending_data = None
+        print("[GIF] GIF加载失败，回退到静态图片处理")
+        if data:
+            self._show_static_image(data)
+    
     def _on_gif_frame_changed(self, pixmap: QPixmap):
         """GIF帧变化处理"""
         if pixmap and not pixmap.isNull():
@@ -2087,7 +2292,7 @@ class ImageViewerDialog(QMainWindow):
     def closeEvent(self, event):
         """关闭事件"""
         if self.download_thread and self.download_thread.isRunning():
-            self.download_thread.terminate()
+            self.download_thread.cancel()
             self.download_thread.wait()
         
         if self.media_player:
@@ -393,7 +393,23 @@ class ImageThumbnail(QFrame):
             self._set_state(ThumbnailState.PLACEHOLDER)
             return
         
-        # 优先尝试按ID从本地缩略图目录加载
+        # 进程内像素图缓存命中时直接显示，翻页返回时无需再读盘解码
+        try:
+            memo_pm = self._find_cached_pixmap()
+            if memo_pm is not None and not memo_pm.isNull():
+                if self._image_label:
+                    self._image_label.setPixmap(memo_pm)
+                    self._image_label.setStyleSheet(ThumbnailStyle.get_image_label_style())
+                    try:
+                        self._apply_content_blur_if_needed()
+                    except Exception:
+                        pass
+                self._set_state(ThumbnailState.LOADED)
+                return
+        except Exception:
+            pass
+        
+        # 其次尝试按ID从本地缩略图目录加载
         try:
             image_id = self._image_data.get('id')
             if image_id and hasattr(self._image_loader, 'cache_manager') and hasattr(self._image_loader.cache_manager, 'load_thumbnail'):
@@ -413,6 +429,7 @@ class ImageThumbnail(QFrame):
                             self._apply_content_blur_if_needed()
                         except Exception:
                             pass
+                    self._cache_scaled_pixmap(scaled_pm)
                     self._set_state(ThumbnailState.LOADED)
                     return
         except Exception:
@@ -439,6 +456,34 @@ class ImageThumbnail(QFrame):
             # 使用普通图片加载器
             self._image_loader.load_image(url, thumbnail_size=self._thumbnail_size)
     
+    def _memory_cache(self):
+        """
+        返回持有内存缓存的 ImageLoader（经 ThumbnailCache 包装时取其内部加载器）
+        缩略图与加载器共用同一组 URL@尺寸 键和 TinyLFU 准入，不另行写入 QPixmapCache
+        """
+        loader = self._image_loader
+        if loader is not None and not hasattr(loader, 'find_cached'):
+            loader = getattr(loader, 'image_loader', None)
+        if loader is not None and hasattr(loader, 'find_cached'):
+            return loader
+        return None
+
+    def _find_cached_pixmap(self) -> Optional[QPixmap]:
+        """在加载器内存缓存中查找当前显示尺寸的缩略图"""
+        cache = self._memory_cache()
+        url = self._get_best_image_url()
+        if cache is None or not url:
+            return None
+        return cache.find_cached(url, self._thumbnail_size)
+
+    def _cache_scaled_pixmap(self, pixmap: QPixmap):
+        """将已缩放的缩略图写入加载器内存缓存（覆盖同键条目，不重复占用）"""
+        cache = self._memory_cache()
+        url = self._get_best_image_url()
+        if cache is None or not url:
+            return
+        cache.cache_pixmap(url, self._thumbnail_size, pixmap)
+    
     def _get_best_image_url(self) -> Optional[str]:
         """获取最佳图片URL"""
         # 优先级：缩略图 -> 预览图 -> 原图
@@ -549,6 +594,9 @@ class ImageThumbnail(QFrame):
                 mode
             )
             self._image_label.setPixmap(scaled_pixmap)
+            # 滚动中的快速缩放质量较低，只缓存平滑缩放的结果
+            if mode == Qt.TransformationMode.SmoothTransformation:
+                self._cache_scaled_pixmap(scaled_pixmap)
             # 恢复正常的图片标签样式
             self._image_label.setStyleSheet(ThumbnailStyle.get_image_label_style())
             try:
@@ -616,14 +664,14 @@ class ImageThumbnail(QFrame):
     def enterEvent(self, event):
         """鼠标进入事件"""
         self._animate_hover_enter()
-        if self._event_manager:
+        if self._event_manager and self._event_manager.hover_enabled:
             self._event_manager.handle_mouse_enter(self, event)
         super().enterEvent(event)
     
     def leaveEvent(self, event):
         """鼠标离开事件"""
         self._animate_hover_leave()
-        if self._event_manager:
+        if self._event_manager and self._event_manager.hover_enabled:
             self._event_manager.handle_mouse_leave(self, event)
         super().leaveEvent(event)
     
@@ -702,11 +750,42 @@ class ImageThumbnail(QFrame):
             self._click_animation.setEndValue(1.0)
             self._click_animation.start()
     
+    def set_thumbnail_size(self, size: Tuple[int, int]):
+        """调整缩略图尺寸，并按新尺寸重新加载图片"""
+        size = tuple(size)
+        if size == tuple(self._thumbnail_size):
+            return
+        self._thumbnail_size = size
+        self.setFixedSize(size[0] + 20, size[1] + 20)
+        if self._image_label:
+            self._image_label.setFixedSize(*size)
+        if self._image_loader and self._image_data:
+            self._load_image()
+    
+    def reset(self, image_data: Dict[str, Any]):
+        """复用组件时绑定新的图片：清除旧图片、选中状态与模糊效果后重新加载"""
+        self._image_data = image_data
+        if self._event_manager:
+            self._event_image_data = image_data
+        self._is_selected = False
+        self._is_favorited = image_data.get('is_favorite', False)
+        if self._image_label:
+            self._image_label.setGraphicsEffect(None)
+        self._state = ThumbnailState.PLACEHOLDER
+        self._update_image_display()
+        self._update_styles()
+        self._update_info_display()
+        if self._image_loader:
+            self._load_image()
+    
     def update_image_data(self, image_data: Dict[str, Any]):
         """更新图片数据"""
         self._image_data = image_data
+        if self._event_manager:
+            # 组件被网格复用时，事件管理器上报的数据也要随之更新
+            self._event_image_data = image_data
         self._update_info_display()
-        
+
         # 如果URL发生变化，重新加载图片
         if self._image_loader:
             self._load_image()
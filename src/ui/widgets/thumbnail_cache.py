@@ -4,13 +4,19 @@
 提供更高级的缓存策略和预加载功能
 """
 
-from typing import Dict, List, Optional, Tuple, Set
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Set
+from PyQt6.QtCore import QObject, Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QPixmap
 from .image_loader import ImageLoader
 from ...core.cache_manager import CacheManager
 
 
+# 计时函数缓存为模块级名称，每次加载完成都会调用
+_perf = time.perf_counter
+
+
 class ThumbnailCache(QObject):
     """缩略图缓存管理器"""
     
@@ -31,14 +37,17 @@ class ThumbnailCache(QObject):
         self._ema_alpha = 0.2
         
         # 预加载相关
-        self.preload_queue: List[Tuple[str, Tuple[int, int]]] = []
+        # 队列使用 deque（O(1) 出队），配合集合做 O(1) 去重
+        self.preload_queue: Deque[Tuple[str, Tuple[int, int]]] = deque()
+        self._preload_set: Set[Tuple[str, Tuple[int, int]]] = set()
         self.preload_timer = QTimer()
         self.preload_timer.setSingleShot(True)
         self.preload_timer.timeout.connect(self._process_preload_queue)
         self.preload_delay = 500  # 500ms延迟开始预加载
         
         # 变体预生成
-        self.variant_queue: List[Tuple[str, Tuple[int, int]]] = []
+        self.variant_queue: Deque[Tuple[str, Tuple[int, int]]] = deque()
+        self._variant_set: Set[Tuple[str, Tuple[int, int]]] = set()
         self.variant_timer = QTimer()
         self.variant_timer.setSingleShot(True)
         self.variant_timer.timeout.connect(self._process_variant_queue)
@@ -71,29 +80,56 @@ class ThumbnailCache(QObject):
         Returns:
             bool: 是否立即从缓存返回
         """
+        hit = self._request_thumbnail(url, size, priority)
+        self._update_stats()
+        return hit
+    
+    def load_thumbnails_priority(self, urls: List[str], size: Tuple[int, int]) -> int:
+        """
+        批量高优先级加载缩略图，整批只刷新一次统计
+        
+        Args:
+            urls: 图片URL列表
+            size: 缩略图尺寸
+        
+        Returns:
+            int: 立即从缓存返回的数量
+        """
+        hits = 0
+        misses = []
+        for url in urls:
+            if self._request_thumbnail(url, size, True, submit=False):
+                hits += 1
+            else:
+                misses.append(url)
+        # 未命中的URL一次性提交给加载器，按并发上限排队启动
+        if misses:
+            self.image_loader.load_batch(misses, size, priority=True)
+        if urls:
+            self._update_stats()
+        return hits
+    
+    def _request_thumbnail(self, url: str, size: Tuple[int, int], priority: bool, submit: bool = True) -> bool:
+        """单个缩略图请求（不刷新统计），返回是否立即从缓存返回；submit=False 时未命中的由调用方提交"""
         self.stats['total_requests'] += 1
         
         # 检查内存缓存
-        variant_key = self.cache_manager.get_cache_key(f"{url}|{size[0]}x{size[1]}")
-        cached_pixmap = self.cache_manager.get_from_memory(variant_key)
+        cached_pixmap = self.image_loader.find_cached(url, size)
         
         if cached_pixmap:
             self.stats['cache_hits'] += 1
             self.thumbnail_loaded.emit(url, cached_pixmap)
-            self._update_stats()
             return True
         
         # 检查原始尺寸缓存
-        base_key = self.cache_manager.get_cache_key(url)
-        base_pixmap = self.cache_manager.get_from_memory(base_key)
+        base_pixmap = self.image_loader.find_cached(url)
         
         if base_pixmap:
             # 缩放并缓存
             scaled_pixmap = self._scale_pixmap(base_pixmap, size)
-            self.cache_manager.put_to_memory(variant_key, scaled_pixmap)
+            self.image_loader.cache_pixmap(url, size, scaled_pixmap)
             self.stats['cache_hits'] += 1
             self.thumbnail_loaded.emit(url, scaled_pixmap)
-            self._update_stats()
             return True
         
         # 缓存未命中，需要加载
@@ -103,8 +139,8 @@ class ThumbnailCache(QObject):
             self.priority_urls.add(url)
         
         # 使用ImageLoader加载
-        success = self.image_loader.load_image(url, size)
-        self._update_stats()
+        if submit:
+            self.image_loader.load_image(url, size)
         return False
     
     def preload_thumbnails(self, urls: List[str], size: Tuple[int, int]):
@@ -117,20 +153,22 @@ class ThumbnailCache(QObject):
         """
         uncached_urls = []
         for url in urls:
-            variant_key = self.cache_manager.get_cache_key(f"{url}|{size[0]}x{size[1]}")
-            if not self.cache_manager.get_from_memory(variant_key):
-                base_key = self.cache_manager.get_cache_key(url)
-                base_pm = self.cache_manager.get_from_memory(base_key)
+            if not self.image_loader.find_cached(url, size):
+                base_pm = self.image_loader.find_cached(url)
                 if not base_pm:
                     uncached_urls.append(url)
                 else:
-                    if (url, size) not in self.variant_queue:
-                        self.variant_queue.append((url, size))
+                    req = (url, size)
+                    if req not in self._variant_set:
+                        self._variant_set.add(req)
+                        self.variant_queue.append(req)
         
         # 添加到预加载队列
         for url in uncached_urls:
-            if (url, size) not in self.preload_queue:
-                self.preload_queue.append((url, size))
+            req = (url, size)
+            if req not in self._preload_set:
+                self._preload_set.add(req)
+                self.preload_queue.append(req)
         
         # 启动预加载定时器
         if self.preload_queue and not self.preload_timer.isActive():
@@ -157,11 +195,11 @@ class ThumbnailCache(QObject):
         # 处理预加载请求
         processed = 0
         while self.preload_queue and processed < preload_slots:
-            url, size = self.preload_queue.pop(0)
+            url, size = req = self.preload_queue.popleft()
+            self._preload_set.discard(req)
             
             # 再次检查是否已缓存（可能在等待期间被加载了）
-            variant_key = self.cache_manager.get_cache_key(f"{url}|{size[0]}x{size[1]}")
-            if self.cache_manager.get_from_memory(variant_key):
+            if self.image_loader.find_cached(url, size):
                 continue
             
             # 开始预加载
@@ -181,15 +219,14 @@ class ThumbnailCache(QObject):
         processed = 0
         max_batch = 4
         while self.variant_queue and processed < max_batch:
-            url, size = self.variant_queue.pop(0)
-            variant_key = self.cache_manager.get_cache_key(f"{url}|{size[0]}x{size[1]}")
-            if self.cache_manager.get_from_memory(variant_key):
+            url, size = req = self.variant_queue.popleft()
+            self._variant_set.discard(req)
+            if self.image_loader.find_cached(url, size):
                 continue
-            base_key = self.cache_manager.get_cache_key(url)
-            base_pm = self.cache_manager.get_from_memory(base_key)
+            base_pm = self.image_loader.find_cached(url)
             if base_pm:
                 scaled = self._scale_pixmap(base_pm, size)
-                self.cache_manager.put_to_memory(variant_key, scaled)
+                self.image_loader.cache_pixmap(url, size, scaled)
                 self.thumbnail_loaded.emit(url, scaled)
                 processed += 1
         self._update_stats()
@@ -198,7 +235,6 @@ class ThumbnailCache(QObject):
     
     def _scale_pixmap(self, pixmap: QPixmap, size: Tuple[int, int]) -> QPixmap:
         """缩放图片"""
-        from PyQt6.QtCore import Qt
         return pixmap.scaled(
             size[0], size[1],
             Qt.AspectRatioMode.KeepAspectRatio,
@@ -233,8 +269,7 @@ class ThumbnailCache(QObject):
         }
         self.cache_stats_updated.emit(combined_stats)
         try:
-            import time
-            now_ms = int(time.perf_counter() * 1000)
+            now_ms = int(_perf() * 1000)
             try:
                 hr = float(combined_stats['cache_hit_rate'])
                 avgms = float(load_stats.get('avg_load_ms', 0.0) or 0.0)
@@ -261,8 +296,10 @@ class ThumbnailCache(QObject):
     def clear_preload_queue(self):
         """清空预加载队列"""
         self.preload_queue.clear()
+        self._preload_set.clear()
         self.preload_timer.stop()
         self.variant_queue.clear()
+        self._variant_set.clear()
         self.variant_timer.stop()
     
     def cancel_all_loads(self):
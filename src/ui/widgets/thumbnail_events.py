@@ -77,6 +77,8 @@ class ThumbnailEventManager(QObject):
         self.hover_timer.setSingleShot(True)
         self.hover_timer.timeout.connect(self._handle_hover_timeout)
         self.hover_delay = 200  # 200ms悬停延迟
+        # 悬停跟踪默认关闭：没有订阅者时不必为每次进出构建事件数据并派发信号
+        self.hover_enabled = False
         
         # 多选支持
         self.multi_select_enabled = False
@@ -126,11 +128,13 @@ class ThumbnailEventManager(QObject):
         
         # 鼠标进入事件
         elif event.type() == event.Type.Enter:
-            self._handle_hover_enter(obj, image_data, event)
+            if self.hover_enabled:
+                self._handle_hover_enter(obj, image_data, event)
         
         # 鼠标离开事件
         elif event.type() == event.Type.Leave:
-            self._handle_hover_leave(obj, image_data, event)
+            if self.hover_enabled:
+                self._handle_hover_leave(obj, image_data, event)
         
         return False
     
@@ -254,6 +258,13 @@ class ThumbnailEventManager(QObject):
         if hasattr(thumbnail_widget, '_event_image_data'):
             self._handle_mouse_press(thumbnail_widget, thumbnail_widget._event_image_data, event)
     
+    def enable_hover_tracking(self, enabled: bool = True):
+        """开启或关闭悬停跟踪（thumbnail_hovered/thumbnail_unhovered 信号）"""
+        self.hover_enabled = enabled
+        if not enabled:
+            self.hover_timer.stop()
+            self.hovered_thumbnail = None
+    
     def handle_mouse_enter(self, thumbnail_widget, event):
         """处理鼠标进入事件"""
         if hasattr(thumbnail_widget, '_event_image_data'):
@@ -328,6 +339,9 @@ class ThumbnailEventManager(QObject):
         """注册事件处理器"""
         if event_type in self.event_handlers:
             self.event_handlers[event_type].append(handler)
+            # 注册了悬停处理器时自动开启悬停跟踪
+            if event_type in (ThumbnailEventType.HOVER_ENTER, ThumbnailEventType.HOVER_LEAVE):
+                self.hover_enabled = True
     
     def unregister_event_handler(self, event_type: ThumbnailEventType, handler: Callable):
         """注销事件处理器"""